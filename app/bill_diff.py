@@ -0,0 +1,50 @@
+import os
+import difflib
+import logging
+from .chunking import split_sections, estimate_tokens
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Summarize amended bills from the changed text only, unless the changes are
+# too large a share of the new version for that to save much
+AMENDMENT_DIFF_SUMMARIES = os.getenv("AMENDMENT_DIFF_SUMMARIES", "true").lower() == "true"
+AMENDMENT_DIFF_MAX_RATIO = float(os.getenv("AMENDMENT_DIFF_MAX_RATIO", "0.5"))
+
+def diff_bill_text(old_text, new_text, context=2):
+    """
+    Return the changes between two versions of a bill as a list of hunks.
+
+    Sections are matched first, so untouched sections cost nothing; inside a
+    changed section only the changed lines and a little context are kept, in
+    unified diff form ("-" removed, "+" added).
+    """
+    old_sections = split_sections(old_text)
+    new_sections = split_sections(new_text)
+    matcher = difflib.SequenceMatcher(None, old_sections, new_sections, autojunk=False)
+
+    hunks = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        old_lines = "\n".join(old_sections[i1:i2]).splitlines()
+        new_lines = "\n".join(new_sections[j1:j2]).splitlines()
+        diff = list(difflib.unified_diff(old_lines, new_lines, lineterm="", n=context))
+        # Drop the ---/+++ file header
+        hunk = "\n".join(diff[2:])
+        if hunk.strip():
+            hunks.append(hunk)
+    return hunks
+
+def amendment_hunks(old_text, new_text):
+    """Hunks to summarize from, or None when the whole new version should be summarized instead"""
+    if not (AMENDMENT_DIFF_SUMMARIES and old_text):
+        return None
+    hunks = diff_bill_text(old_text, new_text)
+    diff_tokens = sum(estimate_tokens(hunk) for hunk in hunks)
+    new_tokens = estimate_tokens(new_text)
+    if not hunks or diff_tokens > new_tokens * AMENDMENT_DIFF_MAX_RATIO:
+        logger.info(f"Amendment diff is {diff_tokens} of {new_tokens} tokens, summarizing the full text")
+        return None
+    logger.info(f"Summarizing amendment from {len(hunks)} changed hunks ({diff_tokens} of {new_tokens} tokens)")
+    return hunks
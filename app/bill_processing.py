@@ -1,18 +1,26 @@
 import os
 import re
+import io
+import json
+import hashlib
+import tempfile
 from urllib.parse import urljoin
+from xml.etree.ElementTree import ParseError
 from datetime import datetime
 import logging
 import boto3
 import requests
 from bs4 import BeautifulSoup
-import fitz  # PyMuPDF
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-from .translation import translate_to_spanish
 import openai
+from .llm_cache import chat_completion
+from .chunking import estimate_tokens, split_into_chunks
+from .executors import submit, run_cpu_bound
+from .cache import SQLiteCache
+from .http_client import get_http_session
+from .http_cache import conditional_get, remember_response, get_artifact, set_artifact
+from .pdf_tasks import render_summary_pdf_bytes
+from .document import BillDocument
+from .bill_xml import parse_bill_xml
 
 # Ensure that the OpenAI API key is set
 from .dependencies import openai_api_key
@@ -66,7 +74,8 @@ def get_top_categories(bill_text, categories_list=categories, model="gpt-4o"):
         category_names = [c['name'] for c in categories_list]
         category_name_list = ', '.join(category_names)
 
-        response = openai.ChatCompletion.create(
+        response = chat_completion(
+            template="categories-v1",
             model=model,
             messages=[
                 {"role": "system", "content": "You are an AI that categorizes legislative texts into predefined categories. Select exactly three most relevant categories from the provided list. Only use categories from the provided list."},
@@ -75,7 +84,7 @@ def get_top_categories(bill_text, categories_list=categories, model="gpt-4o"):
         )
         
         # Get the raw category names from the response
-        category_names_response = response['choices'][0]['message']['content'].strip().split('\n')
+        category_names_response = response.strip().split('\n')
         logger.info(f"Raw category response: {category_names_response}")
         
         # Map the category names to their IDs
@@ -100,12 +109,28 @@ def format_categories_for_webflow(openai_output, valid_categories):
     # This function is now deprecated as get_top_categories handles the formatting
     return openai_output
 
-def upload_to_s3(bucket_name, file_path):
+# PDFs larger than this are spilled to a temporary file instead of kept in memory
+PDF_MEMORY_LIMIT_BYTES = int(os.getenv("PDF_MEMORY_LIMIT_MB", "50")) * 1024 * 1024
+
+_s3_client = None
+
+def get_s3_client():
+    """Shared S3 client; boto3 clients are thread-safe"""
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client('s3')
+    return _s3_client
+
+def s3_file_name(name, extension):
+    """Make a bill identifier safe for use in an S3 key, e.g. "SB 1234" -> "SB_1234.pdf" """
+    return f"{re.sub(r'[^A-Za-z0-9_-]+', '_', name).strip('_')}.{extension}"
+
+def upload_fileobj_to_s3(bucket_name, fileobj, file_name, content_type):
+    """Upload a readable binary stream to S3 without going through the local disk"""
     try:
-        s3_client = boto3.client('s3')
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        file_key = f"bill_details/{timestamp}_{file_path.split('/')[-1]}"
-        s3_client.upload_file(file_path, bucket_name, file_key, ExtraArgs={'ACL': 'public-read'})
+        file_key = f"bill_details/{timestamp}_{file_name}"
+        get_s3_client().upload_fileobj(fileobj, bucket_name, file_key, ExtraArgs={'ACL': 'public-read', 'ContentType': content_type})
         object_url = f"https://{bucket_name}.s3.amazonaws.com/{file_key}"
         logger.info(f"Uploaded to S3: {object_url}")
         return object_url
@@ -113,416 +138,479 @@ def upload_to_s3(bucket_name, file_path):
         logger.error(f"S3 upload failed: {e}")
         raise
 
-def download_pdf(pdf_url, local_path="bill_text.pdf"):
+def upload_document_to_s3(bucket_name, document, file_name):
+    """Upload a BillDocument, reusing the earlier upload when the same content was already sent"""
+    artifact = f"s3:{bucket_name}/{file_name}"
+    object_url = get_artifact(document.sha256, artifact)
+    if object_url:
+        logger.info(f"Bill PDF unchanged, reusing S3 upload: {object_url}")
+        return object_url
+
+    with document.fileobj() as fileobj:
+        object_url = upload_fileobj_to_s3(bucket_name, fileobj, file_name, 'application/pdf')
+    set_artifact(document.sha256, artifact, object_url)
+    return object_url
+
+def upload_text_to_s3(bucket_name, text, file_name):
+    return upload_fileobj_to_s3(bucket_name, io.BytesIO(text.encode('utf-8')), file_name, 'text/plain; charset=utf-8')
+
+def fetch_pdf_document(pdf_url, conditional=True):
+    """
+    Download a bill PDF into memory as a BillDocument. Downloads larger than
+    PDF_MEMORY_LIMIT_BYTES continue into a unique temporary file instead.
+
+    With conditional, the request carries the validators of the last download;
+    if the PDF is unchanged nothing is downloaded and the returned document
+    reuses the text extracted last time.
+    """
     try:
-        response = requests.get(pdf_url)
-        if response.status_code == 200:
-            with open(local_path, 'wb') as file:
-                file.write(response.content)
-            logger.info(f"Downloaded PDF: {local_path}")
-            return local_path
+        if conditional:
+            response, entry = conditional_get(pdf_url, stream=True)
         else:
-            raise Exception(f"Failed to download PDF: {pdf_url}")
+            response, entry = get_http_session().get(pdf_url, stream=True), None
+
+        with response:
+            if response.status_code == 304 and entry:
+                return BillDocument(
+                    source=pdf_url,
+                    sha256=entry["sha256"],
+                    loader=lambda: fetch_pdf_document(pdf_url, conditional=False)
+                )
+            if response.status_code != 200:
+                raise Exception(f"Failed to download PDF: {pdf_url}")
+
+            buffer = io.BytesIO()
+            spill_file = None
+            digest = hashlib.sha256()
+            size = 0
+            try:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    if spill_file is None and buffer.tell() + len(chunk) > PDF_MEMORY_LIMIT_BYTES:
+                        spill_file = tempfile.NamedTemporaryFile(prefix="bill_", suffix=".pdf", delete=False)
+                        spill_file.write(buffer.getvalue())
+                        buffer = None
+                    (spill_file or buffer).write(chunk)
+            except Exception:
+                if spill_file is not None:
+                    spill_file.close()
+                    os.remove(spill_file.name)
+                raise
+
+        sha256 = digest.hexdigest()
+        remember_response(pdf_url, response, sha256, size)
+
+        if spill_file is not None:
+            spill_file.close()
+            logger.info(f"Downloaded PDF to temporary file: {spill_file.name}")
+            return BillDocument(path=spill_file.name, source=pdf_url, temporary=True, sha256=sha256)
+
+        logger.info(f"Downloaded PDF into memory: {pdf_url}")
+        return BillDocument(data=buffer.getvalue(), source=pdf_url, sha256=sha256)
     except Exception as e:
         logger.error(f"PDF download failed: {e}")
         raise
 
-def fetch_bill_details(bill_page_url):
+def fetch_bill_page(bill_page_url):
+    """Scrape the title, bill ID and bill text PDF link from a flsenate.gov bill page"""
     logger.info("Starting bill fetch")
     base_url = 'https://www.flsenate.gov'
-    response = requests.get(urljoin(base_url, bill_page_url))
+    page_url = urljoin(base_url, bill_page_url)
+    response, entry = conditional_get(page_url)
     bill_details = {
         "title": "", 
         "description": "", 
         "pdf_path": "", 
+        "pdf_url": "",
         "govId": "", 
         "billTextPath": "",
         "gov-url": bill_page_url
     }
 
-    if response.status_code == 200:
-        soup = BeautifulSoup(response.content, 'html.parser')
-        bill_title_tag = soup.find('div', id='prevNextBillNav').find_next('h2')
-        if bill_title_tag:
-            bill_details["title"] = bill_title_tag.get_text(strip=True)
-            gov_id_match = re.search(r"([A-Z]{2} \d+):", bill_details["title"])
-            if gov_id_match:
-                bill_details["govId"] = gov_id_match.group(1)
-                logger.info(f"Found bill ID: {bill_details['govId']}")
-
-        bill_pdf_link = soup.find('a', class_='lnk_BillTextPDF')
-        if bill_pdf_link:
-            pdf_url = urljoin(base_url, bill_pdf_link['href'])
-            local_pdf_path = download_pdf(pdf_url)
-            bill_details["pdf_path"] = local_pdf_path
-            bill_details["billTextPath"] = upload_to_s3('ddp-bills-2', local_pdf_path)
-
-        full_text = extract_text_from_pdf(bill_details["pdf_path"])
-        
-        # Get categories and add them directly to bill_details
-        category_ids = get_top_categories(full_text)
-        bill_details["categories"] = category_ids
-        logger.info(f"Assigned categories: {category_ids}")
-
-        return bill_details
+    if response.status_code == 304 and entry and entry.get("body"):
+        html = entry["body"]
+    elif response.status_code == 200:
+        html = response.text
+        remember_response(page_url, response, hashlib.sha256(response.content).hexdigest(), len(response.content), body=html)
     else:
         raise Exception("Failed to fetch bill details: HTTP error")
 
-def extract_text_from_pdf(pdf_path):
-    full_text = ""
-    with fitz.open(pdf_path) as pdf:
-        for page_num in range(len(pdf)):
-            page = pdf[page_num]
-            full_text += page.get_text()
-    return full_text
+    soup = BeautifulSoup(html, 'html.parser')
+    bill_title_tag = soup.find('div', id='prevNextBillNav').find_next('h2')
+    if bill_title_tag:
+        bill_details["title"] = bill_title_tag.get_text(strip=True)
+        gov_id_match = re.search(r"([A-Z]{2} \d+):", bill_details["title"])
+        if gov_id_match:
+            bill_details["govId"] = gov_id_match.group(1)
+            logger.info(f"Found bill ID: {bill_details['govId']}")
 
-def fetch_federal_bill_details(session, bill, bill_type):
-    base_url = 'https://www.congress.gov'
-    url_mappings = {
-        "HR": [
-            f'{base_url}/{session}/bills/hr{bill}/BILLS-{session}hr{bill}ih.xml',
-            f'{base_url}/{session}/bills/hr{bill}/BILLS-{session}hr{bill}rh.xml'
-        ],
-        "S": [
-            f'{base_url}/{session}/bills/s{bill}/BILLS-{session}s{bill}fps.xml',
-            f'{base_url}/{session}/bills/s{bill}/BILLS-{session}s{bill}rs.xml',
-            f'{base_url}/{session}/bills/s{bill}/BILLS-{session}s{bill}is.xml'
-        ],
-        "H.Res": [
-            f'{base_url}/{session}/bills/hres{bill}/BILLS-{session}hres{bill}rh.xml'
-        ],
-        "S.Res": [
-            f'{base_url}/{session}/bills/sres{bill}/BILLS-{session}sres{bill}lts.xml'
-        ],
-        "H.J.Res": [
-            f'{base_url}/{session}/bills/hjres{bill}/BILLS-{session}hjres{bill}ih.xml'
-        ],
-        "S.J.Res": [
-            f'{base_url}/{session}/bills/sjres{bill}/BILLS-{session}sjres{bill}rs.xml'
-        ],
-        "H.Con.Res": [
-            f'{base_url}/{session}/bills/hconres{bill}/BILLS-{session}hconres{bill}ih.xml'
-        ],
-        "S.Con.Res": [
-            f'{base_url}/{session}/bills/sconres{bill}/BILLS-{session}sconres{bill}ats.xml'
-        ]
-    }
+    bill_pdf_link = soup.find('a', class_='lnk_BillTextPDF')
+    if bill_pdf_link:
+        bill_details["pdf_url"] = urljoin(base_url, bill_pdf_link['href'])
+
+    return bill_details
 
-    urls = url_mappings.get(bill_type)
-    if not urls:
+# Congress.gov text versions to try for each bill type, most preferred first
+FEDERAL_TEXT_VERSIONS = {
+    "HR": ("hr", ["ih", "rh"]),
+    "S": ("s", ["fps", "rs", "is"]),
+    "H.Res": ("hres", ["rh"]),
+    "S.Res": ("sres", ["lts"]),
+    "H.J.Res": ("hjres", ["ih"]),
+    "S.J.Res": ("sjres", ["rs"]),
+    "H.Con.Res": ("hconres", ["ih"]),
+    "S.Con.Res": ("sconres", ["ats"])
+}
+
+# Remembers which text version was found for a session/type/number. Kept for a
+# day by default since a bill can gain a more preferred version later
+FEDERAL_VERSION_CACHE_PATH = os.getenv("FEDERAL_VERSION_CACHE_PATH", "cache/federal_versions.sqlite3")
+FEDERAL_VERSION_CACHE_TTL = int(os.getenv("FEDERAL_VERSION_CACHE_TTL_HOURS", "24")) * 60 * 60
+
+federal_version_cache = SQLiteCache(FEDERAL_VERSION_CACHE_PATH, table="federal_versions", max_entries=10000, ttl=FEDERAL_VERSION_CACHE_TTL)
+
+def federal_bill_url(session, bill, bill_type, version):
+    prefix = FEDERAL_TEXT_VERSIONS[bill_type][0]
+    return f'https://www.congress.gov/{session}/bills/{prefix}{bill}/BILLS-{session}{prefix}{bill}{version}.xml'
+
+# Function to check whether a bill text URL exists without downloading it
+def probe_federal_url(url):
+    try:
+        response = get_http_session().head(url, allow_redirects=True)
+        if response.status_code in (403, 405, 501):
+            # HEAD not allowed; ask for the first byte only
+            with get_http_session().get(url, headers={"Range": "bytes=0-0"}, stream=True) as ranged:
+                return ranged.status_code in (200, 206)
+        return response.status_code == 200
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Probe failed for {url}: {e}")
+        return False
+
+def resolve_federal_version(session, bill, bill_type):
+    """
+    Return the most preferred text version of a federal bill that exists.
+
+    All candidates are probed concurrently; a remembered version is returned
+    without probing.
+    """
+    if bill_type not in FEDERAL_TEXT_VERSIONS:
         raise ValueError(f"Unsupported bill type: {bill_type}")
+    key = f"{session}:{bill_type}:{bill}"
 
-    valid_url = None
-    for url in urls:
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            valid_url = url
+    try:
+        cached = federal_version_cache.get(key)
+    except Exception as e:
+        logger.warning(f"Federal version cache read failed: {str(e)}")
+        cached = None
+    if cached:
+        return cached
+
+    versions = FEDERAL_TEXT_VERSIONS[bill_type][1]
+    futures = [submit("probe", probe_federal_url, federal_bill_url(session, bill, bill_type, version)) for version in versions]
+    found = None
+    # Wait in preference order so a later version never beats an earlier one that exists
+    for version, future in zip(versions, futures):
+        if future.result():
+            found = version
             break
-        except requests.exceptions.HTTPError:
-            continue
-    else:
+    for future in futures:
+        future.cancel()
+
+    if found is None:
         raise ValueError(f"Bill {bill_type}{bill} not found for session {session}")
 
-    if not response.content:
-        raise ValueError("Empty response from Congress.gov")
+    logger.info(f"Resolved {bill_type} {bill} ({session}) to text version {found}")
+    try:
+        federal_version_cache.set(key, found)
+    except Exception as e:
+        logger.warning(f"Federal version cache write failed: {str(e)}")
+    return found
 
-    soup = BeautifulSoup(response.content, 'lxml-xml')
-    bill_text = soup.get_text()
-    title = soup.find('title').get_text() if soup.find('title') else "No title available"
-    description = "No description available"
+def fetch_federal_bill_details(session, bill, bill_type):
+    version = resolve_federal_version(session, bill, bill_type)
+    valid_url = federal_bill_url(session, bill, bill_type, version)
+    response = get_http_session().get(valid_url, stream=True)
+    if response.status_code == 404:
+        # A remembered version can disappear; forget it and probe again
+        response.close()
+        federal_version_cache.delete(f"{session}:{bill_type}:{bill}")
+        version = resolve_federal_version(session, bill, bill_type)
+        valid_url = federal_bill_url(session, bill, bill_type, version)
+        response = get_http_session().get(valid_url, stream=True)
+
+    with response:
+        response.raise_for_status()
+        # Parsed from the connection as it arrives, never held in memory whole
+        response.raw.decode_content = True
+        try:
+            bill_text = parse_bill_xml(response.raw)
+        except ParseError as e:
+            raise ValueError(f"Empty or invalid bill XML from Congress.gov: {str(e)}")
+    return federal_bill_details(session, bill, bill_type, bill_text, valid_url)
 
-    local_file_path = save_text_to_file(bill_text)
-    bill_text_path = upload_to_s3('ddp-bills-2', local_file_path)
+# Function to build the federal bill details used by the pipeline from a parsed BillText, uploading the text to S3
+def federal_bill_details(session, bill, bill_type, bill_text, gov_url):
+    bill_text_path = upload_text_to_s3('ddp-bills-2', bill_text.text, s3_file_name(f"{session}_{bill_type}_{bill}", "txt"))
 
     bill_details = {
-        "title": title,
-        "description": description,
-        "full_text": bill_text,
+        "title": bill_text.title,
+        "description": bill_text.official_title or "No description available",
+        "bill_text": bill_text,
         "govId": f"{bill_type} {bill}",
         "billTextPath": bill_text_path,
         "history": f"{session}{bill_type}{bill}",
-        "gov-url": valid_url,
+        "gov-url": gov_url,
         "categories": []  # Default empty list for categories
     }
 
     return bill_details
 
-def save_text_to_file(text, file_name='temp_path_for_federal_bill.txt'):
-    with open(file_name, 'w', encoding='utf-8') as file:
-        file.write(text)
-    return file_name
-
-
 # Function to summarize text with OpenAI
-def summarize_with_openai_chat(text, model="gpt-4o"):
-    response = openai.ChatCompletion.create(
+def summarize_with_openai_chat(text, jurisdiction="the Florida senate", model="gpt-4o"):
+    content = chat_completion(
+        template="page-summary-v1",
         model=model,
         messages=[
-            {"role": "system", "content": "You are going to generate a 1-3 sentence response summarizing each page of a bill passed in the Florida senate. You will receive the raw text of each page."},
+            {"role": "system", "content": f"You are going to generate a 1-3 sentence response summarizing each page of a bill passed in {jurisdiction}. You will receive the raw text of each page."},
             {"role": "user", "content": text}
         ]
     )
-    content = response['choices'][0]['message']['content']
     return content
 
+# Map-reduce summarization for bills too large to prompt with in one request
+MAP_REDUCE_THRESHOLD_TOKENS = int(os.getenv("MAP_REDUCE_THRESHOLD_TOKENS", "60000"))
+MAP_REDUCE_CHUNK_TOKENS = int(os.getenv("MAP_REDUCE_CHUNK_TOKENS", "8000"))
+
+def condense_bill_text(full_text, pages=None, jurisdiction="the Florida senate"):
+    """
+    Return the text to prompt with: the bill itself, or for bills above
+    MAP_REDUCE_THRESHOLD_TOKENS the concatenated summaries of its chunks,
+    generated concurrently on the llm pool. Repeats until the result fits.
+    jurisdiction names where the bill was passed in the chunk prompt.
+    """
+    text = full_text
+    while estimate_tokens(text) > MAP_REDUCE_THRESHOLD_TOKENS:
+        chunks = split_into_chunks(text, MAP_REDUCE_CHUNK_TOKENS, pages=pages)
+        if len(chunks) < 2:
+            break
+        logger.info(f"Bill text is ~{estimate_tokens(text)} tokens, summarizing {len(chunks)} chunks")
+        futures = [submit("llm", summarize_with_openai_chat, chunk, jurisdiction) for chunk in chunks]
+        summaries = [future.result() for future in futures]
+        text = "\n\n".join(f"Part {number}: {summary}" for number, summary in enumerate(summaries, start=1))
+        pages = None
+    return text
+
 # Function to summarize full text with OpenAI
 def full_summarize_with_openai_chat(full_text, model="gpt-4o"):
-    response = openai.ChatCompletion.create(
+    summary = chat_completion(
+        template="summary-v1",
         model=model,
         messages=[
             {"role": "system", "content": "You are going to generate a 3-4 sentence response summarizing each page of a bill passed in the Florida senate. You will receive the raw text of each page. Do not include the title of the bills in the summary or the reference numbers. do not mention bill number either. dont include HB "},
             {"role": "user", "content": f"Please summarize the following text:\n\n{full_text}"}
         ]
     )
-    summary = response['choices'][0]['message']['content']
     return summary
 
 # Function to summarize full text with OpenAI in Spanish
 def full_summarize_with_openai_chat_spanish(full_text, model="gpt-4o"):
-    response = openai.ChatCompletion.create(
+    summary = chat_completion(
+        template="summary-es-v1",
         model=model,
         messages=[
             {"role": "system", "content": "Vas a generar una respuesta de 3 a 4 oraciones que resuma cada página de un proyecto de ley aprobado en el Senado de Florida. Recibirá el texto sin formato de cada página. No incluir el título de los proyectos de ley en el resumen ni los números de referencia. Tampoco menciones el número de factura. "},
             {"role": "user", "content": f"Por favor resuma el siguiente texto:\n\n{full_text}"}
         ]
     )
-    summary = response['choices'][0]['message']['content']
     return summary
 
-# Function to generate pros and cons
-def generate_pros_and_cons(full_text):
-    pros_response = openai.ChatCompletion.create(
+# Function to generate pros
+def generate_pros(full_text):
+    pros = chat_completion(
+        template="pros-v1",
         model="gpt-4o",
         messages=[
             {"role": "system", "content": "You are a helpful assistant designed to generate pros for supporting a bill based on its summary. You must specifically have 3 Pros, separated by numbers--no exceptions. Numbers separated as 1) 2) 3)"},
             {"role": "user", "content": f"What are the pros of supporting this bill? make it no more than 2 sentences \n\n{full_text}"}
         ]
     )
-    pros = pros_response['choices'][0]['message']['content']
+    return pros
 
-    cons_response = openai.ChatCompletion.create(
+# Function to generate cons
+def generate_cons(full_text):
+    cons = chat_completion(
+        template="cons-v1",
         model="gpt-4o",
         messages=[
             {"role": "system", "content": "You are a helpful assistant designed to generate cons against supporting a bill based on its summary. You must have specifically 3 Cons, separated by numbers--no exceptions. Numbers separated as 1) 2) 3)"},
             {"role": "user", "content": f"What are the cons of supporting this bill? Make it no more than 2 sentences \n\n{full_text}"}
         ]
     )
-    cons = cons_response['choices'][0]['message']['content']
+    return cons
 
-    return pros, cons
-
-# Function to generate pros and cons in Spanish
-def generate_pros_and_cons_spanish(full_text):
-    pros_response = openai.ChatCompletion.create(
+# Function to generate pros in Spanish
+def generate_pros_spanish(full_text):
+    pros = chat_completion(
+        template="pros-es-v1",
         model="gpt-4o",
         messages=[
             {"role": "system", "content": "Eres un asistente útil diseñado para generar ventajas para respaldar una factura en función de su resumen. Debes tener específicamente 3 profesionales, separados por números, sin excepciones. Números separados como 1) 2) 3)"},
             {"role": "user", "content": f"¿Cuáles son las ventajas de apoyar este proyecto de ley? que no sean más de 2 oraciones \n\n{full_text}"}
         ]
     )
-    pros = pros_response['choices'][0]['message']['content']
+    return pros
 
-    cons_response = openai.ChatCompletion.create(
+# Function to generate cons in Spanish
+def generate_cons_spanish(full_text):
+    cons = chat_completion(
+        template="cons-es-v1",
         model="gpt-4o",
         messages=[
             {"role": "system", "content": "Usted es un asistente útil diseñado para generar desventajas contra el respaldo de un proyecto de ley en función de su resumen. Debes tener específicamente 3 desventajas, separadas por números, sin excepciones. Números separados como 1) 2) 3)"},
             {"role": "user", "content": f"¿Cuáles son las desventajas de apoyar este proyecto de ley? Que no tenga más de 2 oraciones. \n\n{full_text}"}
         ]
     )
-    cons = cons_response['choices'][0]['message']['content']
-
-    return pros, cons
-
-# Function to create summary PDF
-def create_summary_pdf(input_pdf_path, output_pdf_path, title):
-    width, height = letter
-    styles = getSampleStyleSheet()
-    doc = SimpleDocTemplate(output_pdf_path, pagesize=letter)
-    story = []
-
-    story.append(Paragraph(title, styles['Title']))
-    story.append(Spacer(1, 12))
-
-    full_text = ""
-    with fitz.open(input_pdf_path) as pdf:
-        for page_num in range(len(pdf)):
-            page = pdf[page_num]
-            text = page.get_text()
-            full_text += text + " "
-
-    summary = full_summarize_with_openai_chat(full_text)
-    pros, cons = generate_pros_and_cons(full_text)
-
-    story.append(Paragraph(f"<b>Summary:</b><br/>{summary}", styles['Normal']))
-    story.append(Spacer(1, 12))
-
-    data = [['Cons', 'Pros'], [Paragraph(cons, styles['Normal']), Paragraph(pros, styles['Normal'])]]
-    col_widths = [width * 0.45, width * 0.45]
-    t = Table(data, colWidths=col_widths)
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
-        ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
-    ]))
-    story.append(t)
-
-    doc.build(story)
-
-    return os.path.abspath(output_pdf_path), summary, pros, cons
-
-# Function to create summary PDF in Spanish
-def create_summary_pdf_spanish(input_pdf_path, output_pdf_path, title):
-    width, height = letter
-    styles = getSampleStyleSheet()
-    doc = SimpleDocTemplate(output_pdf_path, pagesize=letter)
-    story = []
-
-    story.append(Paragraph(title, styles['Title']))
-    story.append(Spacer(1, 12))
-
-    full_text = ""
-    with fitz.open(input_pdf_path) as pdf:
-        for page_num in range(len(pdf)):
-            page = pdf[page_num]
-            text = page.get_text()
-            full_text += text + " "
-
-    if not full_text.strip():
-        logging.error("No text extracted from PDF for translation.")
-        return None
+    return cons
+
+# Generate summary, pros, cons and categories in a single request instead of four
+COMBINED_GENERATION = os.getenv("COMBINED_GENERATION", "true").lower() == "true"
+
+def format_numbered_points(points):
+    """Format a list of points as "1) ...", one per line, like the per-field prompts produce"""
+    cleaned = [re.sub(r'^\s*(?:\d+[\.\)]|[-•*])\s*', '', str(point)).strip() for point in points]
+    return '\n'.join(f"{number}) {point}" for number, point in enumerate(cleaned, start=1))
+
+def parse_bill_analysis(content, categories_list=categories):
+    """Validate the JSON document returned by generate_bill_analysis; categories_list=None skips categories"""
+    data = json.loads(content)
+    if not isinstance(data, dict):
+        raise ValueError("Analysis is not a JSON object")
+
+    summary = data.get("summary")
+    if not isinstance(summary, str) or not summary.strip():
+        raise ValueError("Analysis is missing a summary")
+
+    points = {}
+    for field in ("pros", "cons"):
+        values = data.get(field)
+        if not isinstance(values, list) or len(values) != 3 or not all(isinstance(v, str) and v.strip() for v in values):
+            raise ValueError(f"Analysis must contain exactly 3 {field}")
+        points[field] = format_numbered_points(values)
+
+    if categories_list is None:
+        return {"summary": summary.strip(), "pros": points["pros"], "cons": points["cons"]}
+
+    category_names = data.get("categories")
+    if not isinstance(category_names, list):
+        raise ValueError("Analysis is missing categories")
+    name_to_id = {c['name']: c['id'] for c in categories_list}
+    category_ids = []
+    for category_name in category_names:
+        clean_name = str(category_name).strip()
+        if clean_name in name_to_id:
+            category_ids.append(name_to_id[clean_name])
+        else:
+            logger.warning(f"Category name '{clean_name}' not found in valid categories")
+    if not category_ids:
+        raise ValueError("Analysis has no valid categories")
+
+    return {
+        "summary": summary.strip(),
+        "pros": points["pros"],
+        "cons": points["cons"],
+        "categories": category_ids[:3]
+    }
 
-    summary = full_summarize_with_openai_chat(full_text)
-    summary_es = translate_to_spanish(summary)
-    pros, cons = generate_pros_and_cons(full_text)
-    pros_es = translate_to_spanish(pros)
-    cons_es = translate_to_spanish(cons)
-
-    story.append(Paragraph(f"<b>Summary:</b><br/>{summary_es}", styles['Normal']))
-    story.append(Spacer(1, 12))
-
-    col_widths = [width * 0.45, width * 0.45]
-
-    data_es = [['Contras', 'Pros'], [Paragraph(cons_es, styles['Normal']), Paragraph(pros_es, styles['Normal'])]]
-    t_es = Table(data_es, colWidths=col_widths)
-    t_es.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
-        ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
-    ]))
-
-    story.append(t_es)
-
-    doc.build(story)
-
-    return os.path.abspath(output_pdf_path), summary_es, pros_es, cons_es
-
-def create_federal_summary_pdf(full_text, output_pdf_path, title):
-    width, height = letter
-    styles = getSampleStyleSheet()
-    doc = SimpleDocTemplate(output_pdf_path, pagesize=letter)
-    story = []
-
-    story.append(Paragraph(title, styles['Title']))
-    story.append(Spacer(1, 12))
-
-    summary = full_summarize_with_openai_chat(full_text)
-    pros, cons = generate_pros_and_cons(full_text)
-
-    story.append(Paragraph(f"<b>Summary:</b><br/>{summary}", styles['Normal']))
-    story.append(Spacer(1, 12))
-
-    data = [['Cons', 'Pros'], [Paragraph(cons, styles['Normal']), Paragraph(pros, styles['Normal'])]]
-    col_widths = [width * 0.45, width * 0.45]
-    t = Table(data, colWidths=col_widths)
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
-        ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
-    ]))
-    story.append(t)
-
-    doc.build(story)
-
-    return os.path.abspath(output_pdf_path), summary, pros, cons
-
-
-# Function to create federal summary PDF in Spanish
-def create_federal_summary_pdf_spanish(full_text, output_pdf_path, title):
-    width, height = letter
-    styles = getSampleStyleSheet()
-    doc = SimpleDocTemplate(output_pdf_path, pagesize=letter)
-    story = []
-
-    story.append(Paragraph(title, styles['Title']))
-    story.append(Spacer(1, 12))
-
-    summary = full_summarize_with_openai_chat_spanish(full_text)
-    pros, cons = generate_pros_and_cons_spanish(full_text)
-
-    story.append(Paragraph(f"<b>Resumen:</b><br/>{summary}", styles['Normal']))
-    story.append(Spacer(1, 12))
-
-    data = [['Contras', 'Pros'], [Paragraph(cons, styles['Normal']), Paragraph(pros, styles['Normal'])]]
-    col_widths = [width * 0.45, width * 0.45]
-    t = Table(data, colWidths=col_widths)
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
-        ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
-    ]))
-    story.append(t)
-
-    doc.build(story)
-
-    return os.path.abspath(output_pdf_path), summary, pros, cons
-
-def validate_and_generate_pros_cons(bill_text, bill_id=None):
-    """Generate pros and cons for a bill"""
-    logger = get_bill_logger(bill_id) if bill_id else main_logger
-    
+# Function to generate summary, pros, cons and categories in one structured request
+def generate_bill_analysis(full_text, language="EN", categories_list=categories, model="gpt-4o"):
+    category_name_list = ', '.join(c['name'] for c in categories_list)
+    language_instruction = " Write the summary, pros and cons in Spanish." if language.upper() == "ES" else ""
+
+    response = chat_completion(
+        template="analysis-v1",
+        model=model,
+        validate=lambda content: parse_bill_analysis(content, categories_list),
+        response_format={"type": "json_object"},
+        messages=[
+            {"role": "system", "content": (
+                "You analyze bills passed in the Florida senate or the US Congress and respond with a JSON object only. "
+                "The object must have exactly these keys: "
+                "\"summary\": a 3-4 sentence summary of the bill. Do not include the title of the bill, reference numbers or the bill number. "
+                "\"pros\": a list of exactly 3 pros of supporting the bill, each no more than 2 sentences. "
+                "\"cons\": a list of exactly 3 cons of supporting the bill, each no more than 2 sentences. "
+                f"\"categories\": a list of the 3 most relevant category names, chosen only from this list: {category_name_list}."
+                f"{language_instruction}"
+            )},
+            {"role": "user", "content": f"Please analyze the following text:\n\n{full_text}"}
+        ]
+    )
+    return parse_bill_analysis(response, categories_list)
+
+# Function to update a summary, pros and cons from the changes in a new version of a bill
+def generate_amended_analysis(hunks, previous, language="EN", model="gpt-4o"):
+    language_instruction = " Write the summary, pros and cons in Spanish." if language.upper() == "ES" else ""
+    changes = "\n\n".join(f"Change {number}:\n{hunk}" for number, hunk in enumerate(hunks, start=1))
+
+    response = chat_completion(
+        template="amended-analysis-v1",
+        model=model,
+        validate=lambda content: parse_bill_analysis(content, categories_list=None),
+        response_format={"type": "json_object"},
+        messages=[
+            {"role": "system", "content": (
+                "A bill passed in the Florida senate has been amended. You receive the summary, pros and cons of the previous "
+                "version and the changes made to its text, in unified diff form: lines starting with \"-\" were removed and "
+                "lines starting with \"+\" were added. Respond with a JSON object only, describing the amended bill as a whole. "
+                "The object must have exactly these keys: "
+                "\"summary\": a 3-4 sentence summary of the bill. Do not include the title of the bill, reference numbers or the bill number. "
+                "\"pros\": a list of exactly 3 pros of supporting the bill, each no more than 2 sentences. "
+                "\"cons\": a list of exactly 3 cons of supporting the bill, each no more than 2 sentences. "
+                "Keep whatever the changes do not affect."
+                f"{language_instruction}"
+            )},
+            {"role": "user", "content": (
+                f"Previous summary:\n{previous['summary']}\n\n"
+                f"Previous pros:\n{previous['pros']}\n\n"
+                f"Previous cons:\n{previous['cons']}\n\n"
+                f"Changes to the bill text:\n\n{changes}"
+            )}
+        ]
+    )
+    return parse_bill_analysis(response, categories_list=None)
+
+def try_generate_amended_analysis(hunks, previous, language="EN"):
+    """Return the updated summary, pros and cons, or None so callers summarize the full text"""
     try:
-        logger.info("Starting pros and cons generation")
-        pros, cons = generate_pros_and_cons(bill_text)
-        
-        def is_valid_format(text):
-            return bool(re.match(r'^\d\).*', text))
-        
-        if not all(is_valid_format(p) for p in pros.split('\n')) or not all(is_valid_format(c) for c in cons.split('\n')):
-            pros, cons = generate_pros_and_cons(bill_text)  # Regenerate if invalid format
+        analysis = generate_amended_analysis(hunks, previous, language=language)
+        logger.info("Generated analysis from amendment diff")
+        return analysis
+    except Exception as e:
+        logger.warning(f"Amendment analysis failed, summarizing the full text: {str(e)}")
+        return None
 
-        logger.info("Completed pros and cons generation", 
-                   extra={'pros_count': len(pros), 'cons_count': len(cons)})
-        return pros, cons
+def try_generate_bill_analysis(full_text, language="EN"):
+    """Return the combined analysis, or None so callers fall back to the per-field functions"""
+    if not COMBINED_GENERATION:
+        return None
+    try:
+        analysis = generate_bill_analysis(full_text, language=language)
+        logger.info("Generated combined bill analysis")
+        return analysis
     except Exception as e:
-        logger.error(f"Error generating pros and cons: {str(e)}", exc_info=True)
-        raise
+        logger.warning(f"Combined bill analysis failed, falling back to per-field generation: {str(e)}")
+        return None
 
-def create_federal_bill_summary(full_text, language="EN", title=""):
+# Function to render a summary PDF from already generated content into a memory buffer
+def render_summary_pdf(title, summary, pros, cons, summary_label="Summary", cons_label="Cons"):
+    pdf_bytes = run_cpu_bound(render_summary_pdf_bytes, title, summary, pros, cons, summary_label=summary_label, cons_label=cons_label)
+    return io.BytesIO(pdf_bytes)
+
+def render_federal_bill_summary(summary, pros, cons, language="EN", title=""):
     """
-    Create summary for federal bills with proper error handling
+    Render the federal summary PDF for already generated content into a BytesIO buffer
     """
-    logger.info("Generating federal bill summary")
-    try:
-        output_pdf_path = "bill_summary.pdf"
-        
-        if language.upper() == "ES":
-            return create_federal_summary_pdf_spanish(full_text, output_pdf_path, title)
-        else:
-            return create_federal_summary_pdf(full_text, output_pdf_path, title)
-            
-    except Exception as e:
-        logger.error(f"Error generating federal bill summary: {str(e)}")
-        raise
\ No newline at end of file
+    if language.upper() == "ES":
+        return render_summary_pdf(title, summary, pros, cons, summary_label="Resumen", cons_label="Contras")
+    else:
+        return render_summary_pdf(title, summary, pros, cons)
@@ -0,0 +1,130 @@
+import threading
+import xml.etree.ElementTree as ElementTree
+
+# Streaming parser for USLM-style bill XML from congress.gov and govinfo
+
+def local_name(tag):
+    """Tag name without its namespace, e.g. "{http://purl.org/dc/elements/1.1/}title" -> "title" """
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ""
+
+def _child_text(element, name):
+    for child in element:
+        if local_name(child.tag) == name:
+            return " ".join("".join(child.itertext()).split())
+    return ""
+
+def _flush(element, upto=None):
+    # Text of element not handed out yet: its own text and the children before
+    # upto (all of them when upto is None), which are then released
+    text = element.text or ""
+    element.text = None
+    for child in list(element):
+        if child is upto:
+            break
+        text += "".join(child.itertext()) + (child.tail or "")
+        element.remove(child)
+    return text
+
+def iter_bill_xml(source):
+    """
+    Stream-parse a bill XML file (path or binary file object), yielding in document order:
+
+    ("title", text) and ("official_title", text) once each,
+    ("section", {"enum", "header", "text"}) for every top-level <section>,
+    ("text", text) for everything outside sections (metadata, form, titles).
+
+    Joining the text of all items gives the full text of the bill. Sections
+    are released as soon as they are yielded, so memory stays bounded by the
+    largest section rather than the whole bill.
+    """
+    stack = []
+    section_depth = 0
+    seen = set()
+    for event, element in ElementTree.iterparse(source, events=("start", "end")):
+        name = local_name(element.tag)
+        if event == "start":
+            if name == "section":
+                if not section_depth:
+                    # Hand out what precedes the section before it begins
+                    path = stack[1:] + [element]
+                    text = "".join(_flush(ancestor, upto) for ancestor, upto in zip(stack, path))
+                    if text:
+                        yield "text", text
+                section_depth += 1
+            stack.append(element)
+            continue
+
+        stack.pop()
+        if name in ("title", "official-title") and name not in seen and not section_depth:
+            seen.add(name)
+            yield name.replace("-", "_"), "".join(element.itertext())
+
+        if name == "section":
+            section_depth -= 1
+            if not section_depth:
+                yield "section", {
+                    "enum": _child_text(element, "enum"),
+                    "header": _child_text(element, "header"),
+                    "text": "".join(element.itertext())
+                }
+                # Keep the emptied element so its tail is still attached to it
+                for child in list(element):
+                    element.remove(child)
+                element.text = None
+        elif not stack:
+            text = _flush(element)
+            if text:
+                yield "text", text
+
+class BillText:
+    """
+    Title, official title and sections of a bill XML, read in one streaming pass.
+
+    The full text is joined from the parsed pieces only when text is first
+    used, and units() splits it at section boundaries for chunking.
+    """
+
+    def __init__(self, source):
+        self.title = None
+        self.official_title = None
+        self.sections = []
+        self._parts = []
+        self._text = None
+        self._lock = threading.Lock()
+
+        for kind, value in iter_bill_xml(source):
+            if kind == "title" and self.title is None:
+                self.title = value
+            elif kind == "official_title":
+                self.official_title = value
+            elif kind == "section":
+                self.sections.append(value)
+                self._parts.append(value)
+            elif kind == "text":
+                self._parts.append(value)
+        if self.title is None:
+            self.title = "No title available"
+
+    @property
+    def text(self):
+        with self._lock:
+            if self._text is None:
+                self._text = "".join(part if isinstance(part, str) else part["text"] for part in self._parts)
+            return self._text
+
+    def units(self):
+        """The text split into the runs between sections and the sections themselves, skipping blank runs"""
+        units = []
+        run = ""
+        for part in self._parts:
+            if isinstance(part, str):
+                run += part
+            else:
+                units.extend([run, part["text"]])
+                run = ""
+        units.append(run)
+        return [unit for unit in units if unit.strip()]
+
+def parse_bill_xml(source):
+    """Parse a bill XML file (path or binary file object) into a BillText"""
+    return BillText(source)
@@ -0,0 +1,291 @@
+import os
+import re
+import sys
+import logging
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup
+from .http_client import get_http_session
+from .models import Bill, FormRequest, ProcessingStatus
+from .bill_xml import parse_bill_xml
+from .bill_processing import FEDERAL_TEXT_VERSIONS, federal_bill_details, federal_bill_url
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bills processed at once during bulk ingestion; requests to each host are
+# additionally limited by HTTP_HOST_RATE_LIMIT
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", "4"))
+
+FLSENATE_BILL_LIST_URL = "https://www.flsenate.gov/Session/Bills/{year}?chamber=both&pageNumber={page}"
+BILL_LINK_PATTERN = re.compile(r'^/Session/Bill/(\d{4})/(\w+)/?$')
+
+# Status message a bill keeps while a bulk run processes it
+BULK_STATUS_MESSAGE = "Processing in bulk ingestion"
+
+def bulk_submission_id(year):
+    return f"bulk-{year}"
+
+def list_session_bills(year, max_pages=200):
+    """Crawl the flsenate.gov bill list of a session and return its bill numbers in listing order"""
+    numbers = []
+    seen = set()
+    for page in range(1, max_pages + 1):
+        response = get_http_session().get(FLSENATE_BILL_LIST_URL.format(year=year, page=page))
+        if response.status_code != 200:
+            raise Exception(f"Failed to fetch bill list page {page} for {year}: HTTP {response.status_code}")
+
+        soup = BeautifulSoup(response.content, 'html.parser')
+        found = 0
+        for link in soup.find_all('a', href=True):
+            match = BILL_LINK_PATTERN.match(link['href'])
+            if match and match.group(1) == str(year) and match.group(2) not in seen:
+                seen.add(match.group(2))
+                numbers.append(match.group(2))
+                found += 1
+        # Paging past the end repeats the last page or returns none
+        if not found:
+            break
+    logger.info(f"Found {len(numbers)} bills for session {year}")
+    return numbers
+
+def bulk_request(year, bill_number, legislation_type="Florida Bills", session="N/A", bill_type=""):
+    """The FormRequest a bulk run submits a bill with; no person or organization is attached"""
+    return FormRequest(
+        name="Bulk ingestion",
+        email="",
+        member_organization="",
+        year=str(year),
+        legislation_type=legislation_type,
+        session=session,
+        bill_number=bill_number,
+        bill_type=bill_type,
+        support="",
+        lan="EN"
+    )
+
+def _needs_processing(db, history_value):
+    # The bill row is the checkpoint: anything already stored is never redone
+    if db.query(Bill).filter(Bill.history == history_value).first():
+        return False
+    job = db.query(ProcessingStatus).filter(ProcessingStatus.submission_id == history_value).first()
+    return not (job and job.status in ("queued", "processing"))
+
+def _claim_bill(session_factory, history_value, claim, set_status):
+    # The pending list can be hours old when a bill comes up, so the bill is
+    # claimed right before it is processed, like an /update-bill/ submission
+    if not claim(history_value, BULK_STATUS_MESSAGE):
+        return False
+    db = session_factory()
+    try:
+        stored = db.query(Bill).filter(Bill.history == history_value).first()
+    finally:
+        db.close()
+    if stored:
+        # Stored by a job that finished after the pending list was made
+        set_status(history_value, "completed", "Bill already stored")
+        return False
+    set_status(history_value, "processing", BULK_STATUS_MESSAGE)
+    return True
+
+def ingest_session(session_factory, year, process_bill, set_status, claim, limit=None):
+    """
+    Process every bill of a Florida session that isn't stored yet.
+
+    process_bill(db, request, history_value) runs one bill through the full
+    pipeline; set_status(submission_id, status, message) records progress and
+    claim(submission_id, message) takes a bill's job as in JobQueue.claim, so
+    a bill submitted some other way meanwhile is skipped.
+    Run as a job under bulk_submission_id(year); its status message reports
+    progress, and each bill gets its own processing_status row. Running it
+    again after a crash skips every bill that was stored.
+    """
+    run_id = bulk_submission_id(year)
+    numbers = list_session_bills(year)
+    if limit:
+        numbers = numbers[:limit]
+
+    db = session_factory()
+    try:
+        pending = [number for number in numbers if _needs_processing(db, f"{year}{number}")]
+    finally:
+        db.close()
+    skipped = len(numbers) - len(pending)
+    logger.info(f"Bulk ingestion {run_id}: {len(pending)} to process, {skipped} already done or in progress")
+
+    counts = {"completed": 0, "failed": 0, "skipped": 0}
+
+    def ingest_bill(number):
+        history_value = f"{year}{number}"
+        if not _claim_bill(session_factory, history_value, claim, set_status):
+            logger.info(f"Bulk ingestion skipped {history_value}, stored or submitted meanwhile")
+            return "skipped"
+        db = session_factory()
+        try:
+            message = process_bill(db, bulk_request(year, number), history_value)
+            set_status(history_value, "completed", message)
+            return "completed"
+        except Exception as e:
+            logger.error(f"Bulk ingestion of {history_value} failed: {str(e)}")
+            set_status(history_value, "failed", str(e))
+            return "failed"
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=BULK_WORKERS, thread_name_prefix="bulk") as pool:
+        for outcome in pool.map(ingest_bill, pending):
+            counts[outcome] += 1
+            set_status(run_id, "processing", (
+                f"{sum(counts.values())}/{len(pending)} bills processed, "
+                f"{counts['failed']} failed, {skipped + counts['skipped']} skipped"
+            ))
+
+    return (
+        f"Bulk ingestion of {year} finished: {counts['completed']} processed, "
+        f"{counts['failed']} failed, {skipped + counts['skipped']} skipped"
+    )
+
+# govinfo BILLS bulk data: one XML per bill version, e.g. BILLS-118hr1234ih.xml
+GOVINFO_MEMBER_PATTERN = re.compile(r'(?:^|/)BILLS-(\d+)([a-z]+?)(\d+)([a-z]+)\.xml$')
+
+# Text versions from earliest to latest stage; unknown versions rank by file date
+GOVINFO_VERSION_ORDER = [
+    "ih", "is", "rih", "ris", "rh", "rs", "rch", "rcs", "rfh", "rfs", "rth", "rts", "rds", "rdh",
+    "eh", "es", "eah", "eas", "ath", "ats", "lth", "lts", "fph", "fps", "pcs", "pch", "cph", "cps", "enr"
+]
+
+def latest_archive_versions(archive):
+    """Map (congress, bill type, number) to the ZipInfo of the latest text version in a govinfo BILLS archive"""
+    type_names = {prefix: bill_type for bill_type, (prefix, versions) in FEDERAL_TEXT_VERSIONS.items()}
+    latest = {}
+    for info in archive.infolist():
+        match = GOVINFO_MEMBER_PATTERN.search(info.filename)
+        if not match or match.group(2) not in type_names:
+            continue
+        congress, prefix, number, version = match.groups()
+        key = (congress, type_names[prefix], number)
+        rank = (GOVINFO_VERSION_ORDER.index(version) if version in GOVINFO_VERSION_ORDER else -1, info.date_time)
+        if key not in latest or rank > latest[key][0]:
+            latest[key] = (rank, version, info)
+    return {key: (version, info) for key, (rank, version, info) in latest.items()}
+
+def ingest_govinfo_archive(session_factory, zip_path, process_bill, set_status, claim, limit=None):
+    """
+    Load every federal bill in a downloaded govinfo BILLS bulk ZIP that isn't stored yet.
+
+    Members are decompressed and parsed as streams, one at a time and never
+    written to disk, and only the latest version of each bill is read. Parsed
+    bills run through process_bill(db, request, details) on BULK_WORKERS
+    threads while the archive is still being read. Progress is recorded under
+    bulk-<archive name>, with checkpoints as in ingest_session.
+    """
+    run_id = bulk_submission_id(os.path.splitext(os.path.basename(zip_path))[0])
+    counts = {"completed": 0, "failed": 0, "skipped": 0}
+    lock = threading.Lock()
+    # Bounds how many parsed bills wait for a worker
+    slots = threading.BoundedSemaphore(BULK_WORKERS * 2)
+
+    with zipfile.ZipFile(zip_path) as archive:
+        versions = latest_archive_versions(archive)
+        db = session_factory()
+        try:
+            pending = sorted(key for key in versions if _needs_processing(db, "".join(key)))
+        finally:
+            db.close()
+        if limit:
+            pending = pending[:limit]
+        skipped = len(versions) - len(pending)
+        logger.info(f"Bulk ingestion {run_id}: {len(pending)} of {len(versions)} bills to process")
+
+        def ingest_bill(key, version, bill_text):
+            congress, bill_type, number = key
+            history_value = "".join(key)
+            db = session_factory()
+            try:
+                details = federal_bill_details(
+                    congress, number, bill_type, bill_text,
+                    federal_bill_url(congress, number, bill_type, version)
+                )
+                request = bulk_request(congress, number, legislation_type="Federal Bills", session=congress, bill_type=bill_type)
+                message = process_bill(db, request, details)
+                set_status(history_value, "completed", message)
+                outcome = "completed"
+            except Exception as e:
+                logger.error(f"Bulk ingestion of {history_value} failed: {str(e)}")
+                set_status(history_value, "failed", str(e))
+                outcome = "failed"
+            finally:
+                db.close()
+                slots.release()
+            with lock:
+                counts[outcome] += 1
+                progress = f"{sum(counts.values())}/{len(pending)} bills processed, {counts['failed']} failed, {skipped + counts['skipped']} skipped"
+            set_status(run_id, "processing", progress)
+
+        with ThreadPoolExecutor(max_workers=BULK_WORKERS, thread_name_prefix="bulk") as pool:
+            for key in pending:
+                version, info = versions[key]
+                if not _claim_bill(session_factory, "".join(key), claim, set_status):
+                    logger.info(f"Bulk ingestion skipped {''.join(key)}, stored or submitted meanwhile")
+                    with lock:
+                        counts["skipped"] += 1
+                    continue
+                slots.acquire()
+                try:
+                    with archive.open(info) as stream:
+                        bill_text = parse_bill_xml(stream)
+                except Exception as e:
+                    slots.release()
+                    logger.error(f"Could not read {info.filename}: {str(e)}")
+                    set_status("".join(key), "failed", str(e))
+                    with lock:
+                        counts["failed"] += 1
+                    continue
+                pool.submit(ingest_bill, key, version, bill_text)
+
+    return (
+        f"Bulk ingestion of {os.path.basename(zip_path)} finished: {counts['completed']} processed, "
+        f"{counts['failed']} failed, {skipped + counts['skipped']} skipped"
+    )
+
+# Command line entry point: python -m app.bulk <year | govinfo BILLS zip> [limit]
+def main(argv):
+    from .main import SessionLocal, job_queue, process_florida_bill_in_bulk, process_federal_bill_in_bulk
+    from .executors import start_pools, shutdown_pools
+    from .http_client import close_http_session
+
+    logging.basicConfig(level=logging.INFO)
+    target = argv[0]
+    limit = int(argv[1]) if len(argv) > 1 else None
+    if target.endswith(".zip"):
+        run_id = bulk_submission_id(os.path.splitext(os.path.basename(target))[0])
+    else:
+        run_id = bulk_submission_id(int(target))
+
+    # Bills left claimed by an earlier command line run that crashed are
+    # released, while those of a running API process are left alone
+    job_queue.owner = f"{job_queue.owner}-bulk"
+    job_queue.recover()
+    if not job_queue.claim(run_id, "Started from the command line"):
+        print(f"{run_id} is already running")
+        sys.exit(1)
+
+    start_pools()
+    try:
+        job_queue.set_status(run_id, "processing", "Started from the command line")
+        if target.endswith(".zip"):
+            message = ingest_govinfo_archive(SessionLocal, target, process_federal_bill_in_bulk, job_queue.set_status, job_queue.claim, limit=limit)
+        else:
+            message = ingest_session(SessionLocal, int(target), process_florida_bill_in_bulk, job_queue.set_status, job_queue.claim, limit=limit)
+        job_queue.set_status(run_id, "completed", message)
+        print(message)
+    except Exception as e:
+        job_queue.set_status(run_id, "failed", str(e))
+        raise
+    finally:
+        shutdown_pools()
+        close_http_session()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,126 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SQLiteCache:
+    """
+    Disk-backed key/value cache with per-entry TTLs and size-bounded LRU eviction.
+
+    Several caches can share one database file as long as they use different
+    tables. Hit and miss counters are kept per instance since process start.
+    """
+
+    def __init__(self, path, table="cache", max_entries=10000, ttl=None):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, "
+                "last_access REAL NOT NULL, expires_at REAL)"
+            )
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_last_access ON {self.table} (last_access)")
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get(self, key):
+        """Return the cached value, or None on a miss or an expired entry."""
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                connection.commit()
+                self.misses += 1
+                return None
+            connection.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key))
+            connection.commit()
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entries beyond max_entries."""
+        now = time.time()
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, last_access, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, now, now, expires_at)
+            )
+            if self.max_entries:
+                connection.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            connection.commit()
+
+    def delete(self, key):
+        with self._lock:
+            connection = self._connect()
+            connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            connection.commit()
+
+    def items(self, limit=None):
+        """Return (key, value) pairs of unexpired entries, most recently written first."""
+        with self._lock:
+            connection = self._connect()
+            return connection.execute(
+                f"SELECT key, value FROM {self.table} WHERE expires_at IS NULL OR expires_at > ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (time.time(), limit if limit is not None else -1)
+            ).fetchall()
+
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            connection.execute(f"DELETE FROM {self.table}")
+            connection.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the number of stored entries."""
+        with self._lock:
+            connection = self._connect()
+            entries = connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries
+        }
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
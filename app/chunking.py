@@ -0,0 +1,57 @@
+import re
+
+# Rough characters-per-token ratio for English legislative text with gpt-4o
+CHARS_PER_TOKEN = 4
+
+# Florida ("Section 1.") and federal ("SEC. 2.") section headings
+SECTION_PATTERN = re.compile(r'(?m)^(?=\s*(?:Section|SECTION|SEC\.)\s+\d+[A-Za-z]?\.)')
+
+def estimate_tokens(text):
+    """Cheap token estimate; good enough for deciding where to split"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def split_sections(text):
+    """Split text in front of each section heading, keeping the headings"""
+    return [part for part in SECTION_PATTERN.split(text) if part.strip()]
+
+def max_chars_for(max_tokens):
+    """Longest text whose estimate_tokens is still within max_tokens"""
+    return max_tokens * CHARS_PER_TOKEN - 1
+
+def _split_oversized(unit, max_tokens):
+    # Fall back to paragraphs, then to fixed-size slices
+    max_chars = max_chars_for(max_tokens)
+    pieces = []
+    for paragraph in re.split(r'\n\s*\n', unit):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+        else:
+            pieces.extend(paragraph[i:i + max_chars] for i in range(0, len(paragraph), max_chars))
+    return pieces
+
+def split_into_chunks(text, max_tokens, pages=None):
+    """
+    Split bill text into chunks of at most max_tokens (estimated).
+
+    Pages are used as the natural boundaries when given, otherwise section
+    headings; consecutive units are packed together until the budget is used.
+    The budget is checked against the joined chunk, separators included.
+    """
+    units = [page for page in pages if page.strip()] if pages else split_sections(text)
+
+    chunks = []
+    current = []
+    current_chars = 0
+    for unit in units:
+        for piece in ([unit] if estimate_tokens(unit) <= max_tokens else _split_oversized(unit, max_tokens)):
+            # Length of the chunk once joined with "\n" if the piece is added
+            joined_chars = current_chars + 1 + len(piece) if current else len(piece)
+            if current and joined_chars > max_chars_for(max_tokens):
+                chunks.append("\n".join(current))
+                current = []
+                joined_chars = len(piece)
+            current.append(piece)
+            current_chars = joined_chars
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -0,0 +1,164 @@
+import os
+import time
+import logging
+import threading
+from contextlib import asynccontextmanager
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Database connection details
+db_host = os.getenv('DB_HOST')
+db_name = os.getenv('DB_NAME')
+db_user = os.getenv('DB_USER')
+db_password = os.getenv('DB_PASSWORD')
+db_port = os.getenv('DB_PORT')
+
+# Connection pool settings. Recycling below MySQL's wait_timeout and pinging on
+# checkout keep connections that sat idle from failing the next request.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds before a connection is replaced
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_WAIT_WARN_SECONDS = float(os.getenv("DB_POOL_WAIT_WARN_SECONDS", "1"))
+
+# Opt-in async engine for endpoints that query without a thread; needs the
+# aiomysql or asyncmy driver installed
+DB_ASYNC_ENABLED = os.getenv("DB_ASYNC_ENABLED", "false").lower() == "true"
+DB_ASYNC_DRIVER = os.getenv("DB_ASYNC_DRIVER", "aiomysql")
+
+class PoolMetrics:
+    """Checkout counts and time spent waiting for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.slow_checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.invalidated = 0
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            if seconds >= DB_POOL_WAIT_WARN_SECONDS:
+                self.slow_checkouts += 1
+        if seconds >= DB_POOL_WAIT_WARN_SECONDS:
+            logger.warning(f"Waited {seconds:.2f}s for a database connection")
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_invalidated(self):
+        with self._lock:
+            self.invalidated += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "invalidated": self.invalidated
+            }
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+def database_url(driver="mysqlconnector"):
+    return f"mysql+{driver}://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+# SQLAlchemy engine and session maker
+engine = create_engine(
+    database_url(),
+    poolclass=InstrumentedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING
+)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@event.listens_for(engine, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    # Stale connections found by pre-ping or dropped mid-query
+    pool_metrics.record_invalidated()
+
+def pool_stats():
+    """Current pool occupancy and checkout metrics"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": DB_MAX_OVERFLOW,
+        **pool_metrics.snapshot()
+    }
+
+_async_engine = None
+_async_session_factory = None
+_async_lock = threading.Lock()
+
+def get_async_session_factory():
+    """Create the async engine on first use; only when DB_ASYNC_ENABLED is set."""
+    global _async_engine, _async_session_factory
+    if not DB_ASYNC_ENABLED:
+        raise RuntimeError("The async database engine is disabled, set DB_ASYNC_ENABLED=true to use it")
+    with _async_lock:
+        if _async_session_factory is None:
+            from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+            _async_engine = create_async_engine(
+                database_url(DB_ASYNC_DRIVER),
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_recycle=DB_POOL_RECYCLE,
+                pool_pre_ping=DB_POOL_PRE_PING
+            )
+            _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False)
+            logger.info(f"Started async database engine ({DB_ASYNC_DRIVER})")
+        return _async_session_factory
+
+@asynccontextmanager
+async def async_session_scope():
+    session = get_async_session_factory()()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+# Dependency: async database session
+async def get_async_db():
+    async with async_session_scope() as session:
+        yield session
+
+async def dispose_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
@@ -0,0 +1,120 @@
+import io
+import os
+import weakref
+import threading
+import fitz  # PyMuPDF
+from .executors import run_cpu_bound
+from .pdf_tasks import extract_pages, extract_added_text
+from .http_cache import get_artifact, set_artifact
+
+class BillDocument:
+    """
+    A bill PDF parsed at most once and shared by every pipeline stage.
+
+    Holds the raw PDF bytes, or for PDFs too large to keep in memory the path
+    of a file holding them; the per-page text, the joined text and the
+    underlined (added) text are extracted lazily on first use, in the worker
+    process pool, and cached.
+    Safe to read from several stages at once. A temporary file is removed when
+    the document is garbage collected.
+
+    With a sha256 of the content, extracted text is also cached across runs in
+    the HTTP cache. A document known only from a 304 response has no content
+    yet; loader is then called to download it if the cached text is missing.
+    """
+
+    def __init__(self, data=None, path=None, source=None, temporary=False, sha256=None, loader=None):
+        if data is None and path is None and loader is None:
+            raise ValueError("BillDocument needs data, a path or a loader")
+        self.data = data
+        self.path = path
+        self.source = source or path
+        self.sha256 = sha256
+        if temporary and path:
+            weakref.finalize(self, _remove_file, path)
+        self._loader = loader
+        self._loaded = None
+        self._pages = None
+        self._text = None
+        self._added_text = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def _content(self):
+        # (data, path) of the PDF, downloading it first for a not-modified document
+        with self._load_lock:
+            if self.data is None and self.path is None:
+                # Keep the loaded document so its temporary file lives as long as this one
+                self._loaded = self._loader()
+                self.data, self.path = self._loaded.data, self._loaded.path
+            return self.data, self.path
+
+    def _cached(self, name, extract):
+        value = get_artifact(self.sha256, name)
+        if value is None:
+            value = run_cpu_bound(extract, *self._content())
+            set_artifact(self.sha256, name, value)
+        return value
+
+    @classmethod
+    def from_path(cls, path):
+        return cls(path=path)
+
+    @property
+    def in_memory(self):
+        return self.data is not None
+
+    def open(self):
+        """Open the PDF with PyMuPDF; use as a context manager."""
+        data, path = self._content()
+        if data is not None:
+            return fitz.open(stream=data, filetype="pdf")
+        return fitz.open(path)
+
+    def fileobj(self):
+        """A readable binary stream of the PDF, e.g. for S3 upload_fileobj"""
+        data, path = self._content()
+        if data is not None:
+            return io.BytesIO(data)
+        return open(path, "rb")
+
+    @property
+    def pages(self):
+        """Text of each page, extracted once"""
+        with self._lock:
+            if self._pages is None:
+                self._pages = self._cached("pages", extract_pages)
+            return self._pages
+
+    @property
+    def text(self):
+        """Text of the whole bill, joined once"""
+        pages = self.pages
+        with self._lock:
+            if self._text is None:
+                self._text = "".join(pages)
+            return self._text
+
+    @property
+    def added_text(self):
+        """Underlined (added) text only, extracted once"""
+        with self._lock:
+            if self._added_text is None:
+                self._added_text = self._cached("added_text", extract_added_text)
+            return self._added_text
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def as_document(pdf):
+    """Accept a BillDocument or a path to a PDF"""
+    if isinstance(pdf, BillDocument):
+        return pdf
+    return BillDocument.from_path(pdf)
@@ -0,0 +1,113 @@
+import os
+import asyncio
+import functools
+import logging
+import importlib
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Pool sizes: network I/O (HTTP, OpenAI, S3, database), CPU-bound PDF work
+# (PyMuPDF, reportlab), browser automation (one Chrome per worker) and the
+# chunk summaries fanned out by map-reduce summarization, and concurrent URL
+# probes made from inside io pool tasks
+POOL_SIZES = {
+    "io": int(os.getenv("IO_POOL_SIZE", "16")),
+    "llm": int(os.getenv("LLM_POOL_SIZE", "4")),
+    "cpu": int(os.getenv("CPU_POOL_SIZE", str(os.cpu_count() or 2))),
+    "browser": int(os.getenv("BROWSER_POOL_SIZE", "1")),
+    "probe": int(os.getenv("PROBE_POOL_SIZE", "8")),
+}
+
+# CPU-bound PDF work (PyMuPDF extraction, reportlab rendering) runs in worker
+# processes so it doesn't hold the API process's GIL; set CPU_POOL_MODE=thread
+# to run it in the calling thread instead
+CPU_POOL_MODE = os.getenv("CPU_POOL_MODE", "process").lower()
+PROCESS_POOL_SIZE = int(os.getenv("PROCESS_POOL_SIZE", str(os.cpu_count() or 2)))
+
+# Imported by each worker process when it starts
+WARM_IMPORTS = ["fitz", "reportlab.platypus", f"{__package__}.pdf_tasks"]
+
+_pools = {}
+_process_pool = None
+
+def get_pool(name):
+    """Return the named executor, creating it on first use."""
+    if name not in POOL_SIZES:
+        raise ValueError(f"Unknown executor pool: {name}")
+    pool = _pools.get(name)
+    if pool is None:
+        pool = ThreadPoolExecutor(max_workers=POOL_SIZES[name], thread_name_prefix=f"{name}-pool")
+        _pools[name] = pool
+        logger.info(f"Started {name} pool with {POOL_SIZES[name]} workers")
+    return pool
+
+def submit(name, func, /, *args, **kwargs):
+    """Submit a blocking call to the named pool and return its Future."""
+    return get_pool(name).submit(func, *args, **kwargs)
+
+async def run_in_pool(name, func, /, *args, **kwargs):
+    """Await a blocking call on the named pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_pool(name), functools.partial(func, *args, **kwargs))
+
+def _warm_worker():
+    for module in WARM_IMPORTS:
+        importlib.import_module(module)
+
+def _noop():
+    pass
+
+def get_process_pool():
+    """Return the worker process pool, creating it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        # spawn, not fork: the API process already runs threads
+        _process_pool = ProcessPoolExecutor(
+            max_workers=PROCESS_POOL_SIZE,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker
+        )
+        logger.info(f"Started process pool with {PROCESS_POOL_SIZE} workers")
+    return _process_pool
+
+def run_cpu_bound(func, /, *args, **kwargs):
+    """
+    Run a CPU-bound call in the process pool and block until it returns.
+
+    func and its arguments must be picklable (a module-level function taking
+    bytes and strings). Called from pool threads, which wait with the GIL
+    released. If the pool has died the call runs in the calling thread.
+    """
+    global _process_pool
+    if CPU_POOL_MODE != "process":
+        return func(*args, **kwargs)
+    try:
+        return get_process_pool().submit(func, *args, **kwargs).result()
+    except BrokenProcessPool:
+        logger.warning(f"Process pool is broken, running {func.__name__} in the calling thread")
+        _process_pool = None
+        return func(*args, **kwargs)
+
+def start_pools():
+    """Create every pool up front so the first request doesn't pay for it."""
+    for name in POOL_SIZES:
+        get_pool(name)
+    if CPU_POOL_MODE == "process":
+        # Submitting one task per worker starts them all now, with their imports warmed
+        pool = get_process_pool()
+        for _ in range(PROCESS_POOL_SIZE):
+            pool.submit(_noop)
+
+def shutdown_pools(wait=False):
+    global _process_pool
+    for name, pool in list(_pools.items()):
+        pool.shutdown(wait=wait)
+        del _pools[name]
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=wait)
+        _process_pool = None
+    logger.info("Executor pools stopped")
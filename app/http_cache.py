@@ -0,0 +1,105 @@
+import os
+import json
+import logging
+import threading
+from datetime import date
+from .cache import SQLiteCache
+from .http_client import get_http_session
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Conditional-GET cache for bill pages and PDFs
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", "cache/http_cache.sqlite3")
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "20000"))
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+
+# ETag / Last-Modified, content hash and size per URL
+validator_cache = SQLiteCache(HTTP_CACHE_PATH, table="http_validators", max_entries=HTTP_CACHE_MAX_ENTRIES)
+# Work derived from a document (extracted text, S3 URL), keyed by its content hash
+artifact_cache = SQLiteCache(HTTP_CACHE_PATH, table="document_artifacts", max_entries=HTTP_CACHE_MAX_ENTRIES)
+# Daily request and bytes-saved counters
+savings_cache = SQLiteCache(HTTP_CACHE_PATH, table="http_savings", max_entries=366)
+
+_savings_lock = threading.Lock()
+
+def _load(cache, key):
+    try:
+        value = cache.get(key)
+    except Exception as e:
+        logger.warning(f"HTTP cache read failed: {str(e)}")
+        return None
+    return json.loads(value) if value is not None else None
+
+def _store(cache, key, value):
+    try:
+        cache.set(key, json.dumps(value))
+    except Exception as e:
+        logger.warning(f"HTTP cache write failed: {str(e)}")
+
+def conditional_get(url, **kwargs):
+    """
+    GET url with If-None-Match / If-Modified-Since from the last response.
+
+    Returns the response and the stored entry. On a 304 the entry holds what
+    is known about the unchanged content; on any other status it is the
+    previous entry (or None) and the caller should call remember_response.
+    """
+    entry = _load(validator_cache, url) if HTTP_CACHE_ENABLED else None
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = get_http_session().get(url, headers=headers, **kwargs)
+    if response.status_code == 304 and entry:
+        logger.info(f"Not modified since last fetch: {url}")
+        record_request(not_modified=True, bytes_saved=entry.get("size", 0))
+    else:
+        record_request()
+    return response, entry
+
+def remember_response(url, response, sha256, size, body=None):
+    """Store the validators of a 200 response, with the body for small text pages"""
+    if not HTTP_CACHE_ENABLED:
+        return
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not (etag or last_modified):
+        return
+    entry = {"etag": etag, "last_modified": last_modified, "sha256": sha256, "size": size}
+    if body is not None:
+        entry["body"] = body
+    _store(validator_cache, url, entry)
+
+def get_artifact(sha256, name):
+    """Return a value derived from the document with this content hash, or None"""
+    if not (HTTP_CACHE_ENABLED and sha256):
+        return None
+    return _load(artifact_cache, f"{sha256}:{name}")
+
+def set_artifact(sha256, name, value):
+    if HTTP_CACHE_ENABLED and sha256:
+        _store(artifact_cache, f"{sha256}:{name}", value)
+
+def record_request(not_modified=False, bytes_saved=0):
+    key = date.today().isoformat()
+    with _savings_lock:
+        day = _load(savings_cache, key) or {"requests": 0, "not_modified": 0, "bytes_saved": 0}
+        day["requests"] += 1
+        if not_modified:
+            day["not_modified"] += 1
+            day["bytes_saved"] += bytes_saved
+        _store(savings_cache, key, day)
+
+def http_cache_stats(days=30):
+    """Conditional-GET counters and bytes saved for each of the last days with traffic"""
+    daily = [{"date": key, **json.loads(value)} for key, value in savings_cache.items(limit=days)]
+    return {
+        "validators": validator_cache.stats()["entries"],
+        "artifacts": artifact_cache.stats()["entries"],
+        "bytes_saved": sum(day["bytes_saved"] for day in daily),
+        "daily": daily
+    }
@@ -0,0 +1,120 @@
+import os
+import time
+import logging
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Outbound HTTP settings shared by the bill scrapers and the Webflow client
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # hosts kept pooled
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))  # keep-alive connections per host
+
+# Requests per second sent to any one host; 0 disables the limit
+HTTP_HOST_RATE_LIMIT = float(os.getenv("HTTP_HOST_RATE_LIMIT", "5"))
+# Per-host overrides, e.g. "www.flsenate.gov=2,www.congress.gov=1"
+HTTP_HOST_RATE_LIMITS = os.getenv("HTTP_HOST_RATE_LIMITS", "")
+
+# Responses worth retrying; only idempotent methods (GET, HEAD, PUT, DELETE,
+# OPTIONS) are retried so a create is never sent twice
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def parse_host_rates(value):
+    """Parse "host=rate,host=rate" into a dict of requests per second by host"""
+    rates = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        host, separator, rate = entry.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid host rate limit: {entry}")
+        rates[host.strip().lower()] = float(rate)
+    return rates
+
+class HostRateLimiter:
+    """
+    Spaces out requests to each host so no more than its rate are started per second.
+
+    Every host has its own schedule; host_rates overrides the default rate for
+    the hosts it names, and a rate of 0 leaves that host unlimited.
+    """
+
+    def __init__(self, rate, host_rates=None):
+        self.default_interval = self._interval(rate)
+        self.intervals = {host.lower(): self._interval(host_rate) for host, host_rate in (host_rates or {}).items()}
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _interval(rate):
+        return 1.0 / rate if rate > 0 else 0
+
+    def interval(self, host):
+        return self.intervals.get((host or "").lower(), self.default_interval)
+
+    def wait(self, host):
+        interval = self.interval(host)
+        if not interval:
+            return
+        host = (host or "").lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+_session = None
+_session_lock = threading.Lock()
+_rate_limiter = HostRateLimiter(HTTP_HOST_RATE_LIMIT, parse_host_rates(HTTP_HOST_RATE_LIMITS))
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies the default timeouts and the per-host rate limit"""
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+        _rate_limiter.wait(urlparse(url).hostname)
+        return super().request(method, url, **kwargs)
+
+def create_http_session():
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    session = TimeoutSession()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_http_session():
+    """Return the shared session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_http_session()
+            logger.info("Started shared HTTP session")
+        return _session
+
+def start_http_session():
+    get_http_session()
+
+def close_http_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+            logger.info("Closed shared HTTP session")
@@ -0,0 +1,225 @@
+import os
+import json
+import logging
+import queue
+import socket
+import datetime
+import threading
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from .models import ProcessingStatus
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Statuses that mean a job is still owned by a worker
+ACTIVE_STATUSES = ("queued", "processing")
+
+# An active job not updated for this long is assumed lost (e.g. its worker
+# process died) and may be claimed again
+JOB_STALE_AFTER_MINUTES = int(os.getenv("JOB_STALE_AFTER_MINUTES", "180"))
+
+# Identifies this process on the jobs it claims, so its jobs that were lost in
+# a restart can be found again; must differ between processes sharing a host
+JOB_WORKER_ID = os.getenv("JOB_WORKER_ID", socket.gethostname())
+
+# How long a worker waits for a job before checking whether it should stop
+JOB_POLL_SECONDS = 1
+
+class JobQueue:
+    """
+    In-process job runner backed by the processing_status table.
+
+    Jobs are keyed by their submission_id. Every state change is written to the
+    matching ProcessingStatus row so the status endpoint can report on jobs that
+    are still waiting, running or have failed. The row is also the lock: only
+    one job per submission_id can be active, across all API workers.
+
+    Queued jobs are only held in memory; recover() fails the ones this owner
+    left behind when its process stopped, so they can be submitted again.
+
+    on_complete(submission_id) and on_fail(submission_id) are called after a
+    job is marked completed or failed.
+    """
+
+    def __init__(self, session_factory, max_workers=2, max_queue_size=100, on_complete=None, on_fail=None, owner=JOB_WORKER_ID):
+        self.session_factory = session_factory
+        self.max_workers = max_workers
+        self.on_complete = on_complete
+        self.on_fail = on_fail
+        self.owner = owner
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._workers = []
+
+    def start(self):
+        """Start the worker threads (no-op if already running)."""
+        if self._workers:
+            return
+        self._stop.clear()
+        for index in range(self.max_workers):
+            worker = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        logger.info(f"Started {self.max_workers} job workers")
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker threads once they finish their current job.
+
+        Jobs still waiting stay queued in the database; the next recover() by
+        this owner marks them failed.
+        """
+        self._stop.set()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        self._workers = []
+        logger.info("Job workers stopped")
+
+    def recover(self):
+        """Mark the jobs this owner left queued or processing (e.g. before a restart) failed; returns how many."""
+        db = self.session_factory()
+        try:
+            recovered = db.query(ProcessingStatus).filter(
+                ProcessingStatus.owner == self.owner,
+                ProcessingStatus.status.in_(ACTIVE_STATUSES)
+            ).update(
+                {"status": "failed", "message": "Interrupted by a restart, please submit again"},
+                synchronize_session=False
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        if recovered:
+            logger.warning(f"Marked {recovered} interrupted jobs of {self.owner} failed")
+        return recovered
+
+    def enqueue(self, submission_id, func, *args, **kwargs):
+        """
+        Record a queued job and hand it to the worker pool.
+
+        func is called as func(db, *args, **kwargs) with a session owned by the
+        worker; its return value becomes the completion message.
+        Returns False without queueing anything when a job for submission_id
+        is already active. Raises queue.Full when the queue is at capacity.
+        """
+        if not self.claim(submission_id, "Waiting for a worker"):
+            logger.info(f"Job {submission_id} is already active, not queued again")
+            return False
+        try:
+            self._queue.put_nowait((submission_id, func, args, kwargs))
+        except queue.Full:
+            # No failure hook: it would only try to queue again
+            self._write_status(submission_id, "failed", "Job queue is full, please try again later")
+            raise
+        logger.info(f"Queued job {submission_id} ({self._queue.qsize()} waiting)")
+        return True
+
+    def claim(self, submission_id, message=None):
+        """
+        Atomically mark a submission queued unless a job for it is already active.
+
+        The conditional update and the unique submission_id make this safe
+        between threads and processes; returns whether the caller got the job.
+        """
+        stale = datetime.datetime.now() - datetime.timedelta(minutes=JOB_STALE_AFTER_MINUTES)
+        db = self.session_factory()
+        try:
+            updated = db.query(ProcessingStatus).filter(
+                ProcessingStatus.submission_id == submission_id,
+                or_(
+                    ProcessingStatus.status.is_(None),
+                    ProcessingStatus.status.notin_(ACTIVE_STATUSES),
+                    ProcessingStatus.updated_at < stale
+                )
+            ).update({"status": "queued", "message": message, "owner": self.owner}, synchronize_session=False)
+            if not updated:
+                # No row yet, or an active one; the unique constraint decides
+                db.add(ProcessingStatus(submission_id=submission_id, status="queued", message=message, owner=self.owner))
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+            return False
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def set_status(self, submission_id, status, message=None):
+        """Create or update the processing_status row for a submission, then run the completion or failure hook."""
+        self._write_status(submission_id, status, message)
+
+        hook = {"completed": self.on_complete, "failed": self.on_fail}.get(status)
+        if hook:
+            try:
+                hook(submission_id)
+            except Exception as e:
+                logger.error(f"{status.capitalize()} hook failed for job {submission_id}: {str(e)}", exc_info=True)
+
+    def _write_status(self, submission_id, status, message=None):
+        db = self.session_factory()
+        try:
+            row = db.query(ProcessingStatus).filter(ProcessingStatus.submission_id == submission_id).first()
+            if row is None:
+                row = ProcessingStatus(submission_id=submission_id)
+                db.add(row)
+            row.status = status
+            row.message = message
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def create_group(self, group_id, submission_ids, message=None):
+        """Record a group of jobs under one submission id; its status is derived from the members."""
+        db = self.session_factory()
+        try:
+            db.add(ProcessingStatus(
+                submission_id=group_id,
+                status="processing",
+                message=message,
+                members=json.dumps(list(submission_ids))
+            ))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                job = self._queue.get(timeout=JOB_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            submission_id, func, args, kwargs = job
+            try:
+                self._run(submission_id, func, args, kwargs)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, submission_id, func, args, kwargs):
+        try:
+            self.set_status(submission_id, "processing", "Processing started")
+            db = self.session_factory()
+            try:
+                message = func(db, *args, **kwargs)
+            finally:
+                db.close()
+            self.set_status(submission_id, "completed", message or "Processing completed")
+            logger.info(f"Job {submission_id} completed")
+        except Exception as e:
+            logger.error(f"Job {submission_id} failed: {str(e)}", exc_info=True)
+            try:
+                self.set_status(submission_id, "failed", str(e))
+            except Exception as status_error:
+                logger.error(f"Could not record failure for job {submission_id}: {str(status_error)}")
@@ -0,0 +1,64 @@
+import os
+import json
+import hashlib
+import logging
+import openai
+from .cache import SQLiteCache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Cache configuration
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "cache/llm_cache.sqlite3")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL_DAYS", "30")) * 24 * 60 * 60
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "false").lower() == "true"
+
+llm_cache = SQLiteCache(LLM_CACHE_PATH, table="llm_responses", max_entries=LLM_CACHE_MAX_ENTRIES, ttl=LLM_CACHE_TTL)
+
+def cache_key(model, template, messages, options=None):
+    """Build the cache key from the model, prompt template version and a SHA-256 of the prompt input"""
+    payload = json.dumps({"messages": messages, "options": options or {}}, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{model}:{template}:{digest}"
+
+def chat_completion(model, messages, template, bypass_cache=False, validate=None, **options):
+    """
+    Call openai.ChatCompletion.create through the response cache and return the message content.
+
+    template names the prompt and its version (e.g. "summary-v1"); bump it
+    whenever the prompt wording changes. With bypass_cache (or LLM_CACHE_BYPASS)
+    the cache is not read, but the fresh response still replaces the entry.
+    validate, if given, is called on a fresh response before it is cached and
+    may raise to keep an unusable response out of the cache. Cached entries are
+    validated too, so one stored before a check was tightened is fetched again.
+    """
+    key = cache_key(model, template, messages, options)
+
+    if not (bypass_cache or LLM_CACHE_BYPASS):
+        try:
+            cached = llm_cache.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {str(e)}")
+            cached = None
+        if cached is not None and validate:
+            try:
+                validate(cached)
+            except Exception as e:
+                logger.warning(f"Cached {template} response is no longer valid: {str(e)}")
+                cached = None
+        if cached is not None:
+            logger.info(f"LLM cache hit for {template}")
+            return cached
+
+    response = openai.ChatCompletion.create(model=model, messages=messages, **options)
+    content = response['choices'][0]['message']['content']
+    if validate:
+        validate(content)
+
+    try:
+        llm_cache.set(key, content)
+    except Exception as e:
+        logger.warning(f"LLM cache write failed: {str(e)}")
+
+    return content
@@ -1,17 +1,33 @@
 import os
+import json
+import uuid
+import queue
 import logging
+from typing import List
+from collections import Counter
 from fastapi import FastAPI, HTTPException, Request, Response, Depends
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy import select
 import boto3
 import openai
-from .bill_processing import fetch_bill_details, fetch_federal_bill_details, create_summary_pdf, create_federal_bill_summary
 from .translation import translate_to_spanish
-from .selenium_script import run_selenium_script
-from .models import BillRequest, Bill, BillMeta, FormData, FormRequest, ProcessingStatus
-from .webflow import WebflowAPI, generate_slug
-from fastapi.responses import JSONResponse
-import datetime
+from .models import BillRequest, Bill, BillMeta, BillVersion, FormRequest, ProcessingStatus, PendingSubmission
+from .webflow import WebflowAPI, generate_slug, reformat_title
+from .jobs import JobQueue, ACTIVE_STATUSES
+from .executors import run_in_pool, start_pools, shutdown_pools
+from .http_client import start_http_session, close_http_session
+from .stages import run_stages, run_stages_async
+from .pipeline import FLORIDA_BILL_STAGES, FLORIDA_FINGERPRINT_STAGES, FLORIDA_CONTENT_STAGES, FLORIDA_AMENDMENT_STAGES, FEDERAL_BILL_STAGES, FEDERAL_DETAILS_STAGES, FEDERAL_CONTENT_STAGES
+from .bill_diff import amendment_hunks
+from .bulk import ingest_session, bulk_submission_id
+from .migrations import check_schema
+from .persistence import save_bill, meta_rows, form_data
+from .db import engine, SessionLocal, DB_ASYNC_ENABLED, async_session_scope, dispose_async_engine, pool_stats
+from .llm_cache import llm_cache
+from .bill_processing import federal_version_cache, render_federal_bill_summary
+from .http_cache import http_cache_stats
+from .text_normalizer import normalization_stats
+from fastapi.responses import JSONResponse, StreamingResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,17 +54,6 @@ s3_client = boto3.client(
 
 BUCKET_NAME = "ddp-bills-2"
 
-# Database connection details
-db_host = os.getenv('DB_HOST')
-db_name = os.getenv('DB_NAME')
-db_user = os.getenv('DB_USER')
-db_password = os.getenv('DB_PASSWORD')
-db_port = os.getenv('DB_PORT')
-
-# SQLAlchemy engine and session maker
-engine = create_engine(f"mysql+mysqlconnector://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}")
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 # Initialize WebflowAPI
 webflow_api = WebflowAPI(
     api_key=os.getenv("WEBFLOW_KEY"),
@@ -56,139 +61,443 @@ webflow_api = WebflowAPI(
     site_id=os.getenv("WEBFLOW_SITE_ID")
 )
 
+# Background job queue for /update-bill/ submissions
+job_queue = JobQueue(
+    SessionLocal,
+    max_workers=int(os.getenv("JOB_WORKERS", "2")),
+    max_queue_size=int(os.getenv("JOB_QUEUE_SIZE", "100"))
+)
+
+# Most bills accepted in one /batch-bills/ submission
+BATCH_MAX_BILLS = int(os.getenv("BATCH_MAX_BILLS", "50"))
+
+@app.on_event("startup")
+def start_workers():
+    check_schema(engine)
+    start_pools()
+    start_http_session()
+    try:
+        job_queue.recover()
+    except Exception as e:
+        logger.error(f"Could not recover interrupted jobs: {str(e)}")
+    job_queue.start()
+
+@app.on_event("shutdown")
+def stop_workers():
+    job_queue.shutdown(wait=False)
+    shutdown_pools()
+    close_http_session()
+
+@app.on_event("shutdown")
+async def close_async_db():
+    await dispose_async_engine()
+
+# Status messages recorded as a queued bill passes these stages
+PROGRESS_MESSAGES = {
+    "page": "Bill page fetched",
+    "details": "Bill text fetched",
+    "analysis": "Summary generated",
+    "webflow": "Published to Webflow, saving the bill"
+}
+
+# Function to build the run_stages callback that reports a job's progress on its status row
+def stage_progress(history_value):
+    def report(stage_name):
+        if stage_name in PROGRESS_MESSAGES:
+            job_queue.set_status(history_value, "processing", PROGRESS_MESSAGES[stage_name])
+    return report
+
+class WebflowItems:
+    """The Webflow item created by a bill's job, kept on its processing_status row for retries."""
+
+    def __init__(self, history_value):
+        self.history_value = history_value
+
+    def get(self):
+        db = job_queue.session_factory()
+        try:
+            row = db.query(ProcessingStatus).filter(ProcessingStatus.submission_id == self.history_value).first()
+            return (row.webflow_item_id, row.webflow_slug) if row and row.webflow_item_id else None
+        finally:
+            db.close()
+
+    def set(self, item):
+        item_id, slug = item
+        db = job_queue.session_factory()
+        try:
+            db.query(ProcessingStatus).filter(ProcessingStatus.submission_id == self.history_value).update(
+                {"webflow_item_id": item_id, "webflow_slug": slug}, synchronize_session=False
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
 # Dependency: Database connection
 def get_db():
-    logger.info("Establishing database connection")
+    logger.debug("Establishing database connection")
     db = SessionLocal()
     try:
         yield db
     finally:
-        logger.info("Closing database connection")
+        logger.debug("Closing database connection")
         db.close()
 
-@app.post("/update-bill/", response_class=Response)
-async def update_bill(request: FormRequest, db: Session = Depends(get_db)):
-    history_value = f"{request.year}{request.bill_number}"
-    logger.info(f"Starting update-bill() for bill: {history_value}")
+# Function to find the stored bill of a history value
+def lookup_stored_bill(db: Session, history_value: str):
+    return db.query(Bill).filter(Bill.history == history_value).first()
+
+def already_stored(db: Session, request: FormRequest, history_value: str, save_submission: bool = True):
+    """
+    Completion message for a claimed job whose bill is stored already, or None.
+
+    The caller checked before claiming, but a job that finished in between
+    may have stored the bill; the submission then only records its stance.
+    """
+    bill = lookup_stored_bill(db, history_value)
+    if bill is None:
+        return None
+    if save_submission:
+        record_stance(db, bill, request)
+    logger.info(f"Bill {history_value} was stored before its job started, not processed again")
+    return f"Bill already stored: {bill.webflow_link}"
+
+def process_florida_bill(db: Session, request: FormRequest, history_value: str, save_submission: bool = True, report_progress: bool = True):
+    """Run the full Florida pipeline for a queued /update-bill/ submission."""
+    try:
+        stored = already_stored(db, request, history_value, save_submission)
+        if stored:
+            return stored
+
+        bill_url = f"https://www.flsenate.gov/Session/Bill/{request.year}/{request.bill_number}"
+        on_stage = stage_progress(history_value) if report_progress else None
+        results = run_stages(FLORIDA_BILL_STAGES, on_stage=on_stage, bill_url=bill_url, request=request, webflow_api=webflow_api, webflow_items=WebflowItems(history_value))
+        bill_details = results["page"]
+        summary, pros, cons = results["summary"], results["pros"], results["cons"]
+        logger.info(f"Processed bill: {bill_url}")
+
+        webflow_item_id, slug = results["webflow"]
+        webflow_url = f"https://digitaldemocracyproject.org/bills/{slug}"
 
+        # Bill, metadata, text version and form data are stored in one transaction
+        save_bill(
+            db,
+            Bill(
+                govId=bill_details["govId"],
+                billTextPath=results["upload"],
+                history=history_value,
+                webflow_link=webflow_url,
+                webflow_item_id=webflow_item_id
+            ),
+            meta_rows(summary, pros, cons, language="EN"),
+            version=new_bill_version(None, results),
+            submission=form_data(request, bill_details["govId"]) if save_submission else None
+        )
+
+        return f"Bill processing completed: {webflow_url}"
+
+    except Exception as processing_error:
+        db.rollback()
+        logger.error(f"Background processing error: {str(processing_error)}")
+        # The error will be visible in the status endpoint
+        raise
+
+# Function to record the text version a bill's content was generated from
+def new_bill_version(bill_id, results):
+    return BillVersion(
+        billId=bill_id,
+        fingerprint=results["fingerprint"],
+        title=results["page"]["title"],
+        source_url=results["page"]["pdf_url"],
+        billTextPath=results["upload"],
+        categories=json.dumps(results["categories"]),
+        text="\n".join(results["clean_pages"])
+    )
+
+def refresh_florida_bill(db: Session, request: FormRequest, history_value: str):
+    """
+    Reprocess an existing Florida bill if its text changed since the last processed version.
+
+    Only the generated content is redone, from the changed text and the
+    previous summary when the amendment is small enough; the Webflow item is
+    updated in place with the fields that changed instead of creating a new one.
+    """
     try:
-        # Check if the history value exists
-        existing_bill = db.query(Bill).filter(Bill.history == history_value).first()
-        if existing_bill:
-            logger.info(f"Bill with history {history_value} already exists")
-            return JSONResponse(content={
-                "message": "Bill already exists",
+        bill = db.query(Bill).filter(Bill.history == history_value).first()
+        bill_url = f"https://www.flsenate.gov/Session/Bill/{request.year}/{request.bill_number}"
+        checked = run_stages(FLORIDA_FINGERPRINT_STAGES, bill_url=bill_url)
+
+        latest = db.query(BillVersion).filter(BillVersion.billId == bill.id).order_by(BillVersion.id.desc()).first()
+        if latest and latest.fingerprint == checked["fingerprint"]:
+            logger.info(f"Bill {history_value} text unchanged, nothing to refresh")
+            return f"Bill text unchanged since {latest.created_at:%Y-%m-%d}, nothing to update: {bill.webflow_link}"
+
+        # Prompt with only the changed text and the previous content when the diff is small
+        results = None
+        hunks = amendment_hunks(latest.text if latest else None, "\n".join(checked["clean_pages"]))
+        if hunks:
+            metas = {meta.type: meta.text for meta in db.query(BillMeta).filter(BillMeta.billId == bill.id, BillMeta.language == "EN")}
+            if all(metas.get(meta_type) for meta_type in ["Summary", "Pro", "Con"]):
+                previous = {"summary": metas["Summary"], "pros": metas["Pro"], "cons": metas["Con"]}
+                amended = run_stages(FLORIDA_AMENDMENT_STAGES, page=checked["page"], document=checked["document"], hunks=hunks, previous=previous)
+                analysis = amended["amended_analysis"]
+                if analysis:
+                    results = {**amended, **analysis, "categories": json.loads(latest.categories or "[]")}
+
+        if results is None:
+            results = run_stages(FLORIDA_CONTENT_STAGES, page=checked["page"], document=checked["document"], clean_pages=checked["clean_pages"])
+        results["fingerprint"] = checked["fingerprint"]
+        results["clean_pages"] = checked["clean_pages"]
+        page = results["page"]
+        logger.info(f"Bill {history_value} text changed, regenerated content")
+
+        # Update the English metadata in place where it changed
+        changed = []
+        for meta_type, text in [("Summary", results["summary"]), ("Pro", results["pros"]), ("Con", results["cons"])]:
+            meta = db.query(BillMeta).filter(BillMeta.billId == bill.id, BillMeta.type == meta_type, BillMeta.language == "EN").first()
+            if meta is None:
+                db.add(BillMeta(billId=bill.id, type=meta_type, text=text, language="EN"))
+            elif meta.text != text:
+                meta.text = text
+            else:
+                continue
+            changed.append(meta_type)
+        bill.billTextPath = results["upload"]
+
+        # Push only the Webflow fields whose inputs changed
+        field_data = {}
+        if latest is None or latest.title != page["title"]:
+            field_data["name"] = reformat_title(page["title"])
+        if latest is None or sorted(json.loads(latest.categories or "[]")) != sorted(results["categories"]):
+            field_data["category"] = results["categories"]
+        if field_data and bill.webflow_item_id:
+            if not webflow_api.update_collection_item(bill.webflow_item_id, {"fieldData": field_data}):
+                raise Exception("Failed to update webflow item")
+            changed.extend(f"webflow {field}" for field in field_data)
+
+        db.add(new_bill_version(bill.id, results))
+        db.commit()
+
+        return f"Bill refreshed ({', '.join(changed) or 'no content changes'}): {bill.webflow_link}"
+
+    except Exception as processing_error:
+        db.rollback()
+        logger.error(f"Background refresh error: {str(processing_error)}")
+        raise
+
+def queue_florida_bill(db: Session, request: FormRequest, history_value: str):
+    """Record the stance on a stored bill, or queue processing unless it is already running; returns (content, status_code)."""
+    existing_bill = db.query(Bill).filter(Bill.history == history_value).first()
+    if existing_bill:
+        # A stored bill only needs the new stance, not another run
+        record_stance(db, existing_bill, request)
+        if not request.refresh:
+            logger.info(f"Bill with history {history_value} already exists, recorded the stance")
+            return {
+                "message": "Bill already exists. Your stance has been recorded.",
                 "status": "success",
+                "history_value": history_value,
+                "webflow_link": existing_bill.webflow_link
+            }, 200
+        if not job_queue.enqueue(history_value, refresh_florida_bill, request, history_value):
+            return {
+                "message": "Bill is already being processed. Your stance has been recorded.",
+                "status": "processing",
                 "history_value": history_value
-            }, status_code=200)
-
-        # Return immediate acknowledgment
-        response = JSONResponse(content={
-            "message": "Request received successfully. Processing will continue in the background.",
+            }, 202
+        return {
+            "message": "Refresh queued. The bill will be reprocessed if its text has changed.",
             "status": "processing",
             "history_value": history_value
-        }, status_code=202)
+        }, 202
 
-        # Start processing in background
-        try:
-            # New bill creation
-            bill_url = f"https://www.flsenate.gov/Session/Bill/{request.year}/{request.bill_number}"
-            bill_details = fetch_bill_details(bill_url)
-            logger.info(f"Obtained bill details for: {bill_url}")
-
-            if not all(k in bill_details for k in ["govId", "billTextPath", "pdf_path", "description"]):
-                raise HTTPException(status_code=500, detail="Required bill details are missing")
-
-            new_bill = Bill(
-                govId=bill_details["govId"], 
-                billTextPath=bill_details["billTextPath"], 
-                history=history_value
-            )
-            db.add(new_bill)
-            db.commit()
+    queued = job_queue.enqueue(history_value, process_florida_bill, request, history_value)
 
-            pdf_path, summary, pros, cons = create_summary_pdf(bill_details['pdf_path'], "output/bill_summary.pdf", bill_details['title'])
-            logger.info("Generated summary")
+    # Another submission of this bill got the job first; ride along with it
+    if not queued:
+        return attach_submission(db, request, history_value)
 
-            for meta_type, text in [("Summary", summary), ("Pro", pros), ("Con", cons)]:
-                new_meta = BillMeta(billId=new_bill.id, type=meta_type, text=text, language="EN")
-                db.add(new_meta)
-            db.commit()
+    return {
+        "message": "Request received successfully. Processing will continue in the background.",
+        "status": "processing",
+        "history_value": history_value
+    }, 202
 
-            logger.info("Running selenium script")
-            kialo_url = run_selenium_script(title=bill_details['govId'], summary=summary, pros_text=pros, cons_text=cons)
-            if kialo_url is None:
-                logger.warning("Selenium script failed but continuing")
-
-            logger.info("Creating webflow item")
-            result = webflow_api.create_live_collection_item(
-                bill_url=bill_details["gov-url"],
-                bill_details=bill_details,
-                kialo_url=kialo_url,
-                support_text=request.member_organization if request.support == "Support" else '',
-                oppose_text=request.member_organization if request.support == "Oppose" else '',
-                jurisdiction="FL",
-                member_organization=request.member_organization
-            )
+def attach_submission(db: Session, request: FormRequest, history_value: str):
+    """Keep a submission for a bill whose job is already active; it is recorded when the job completes."""
+    db.add(PendingSubmission(submission_id=history_value, request=request.model_dump_json()))
+    db.commit()
+    logger.info(f"Bill {history_value} is already being processed, submission attached to the running job")
 
-            if result is None:
-                logger.error("Failed to create webflow item")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Failed to create webflow item. Please ensure all Webflow collection changes are published."
-                )
+    # The job may have completed between the claim and the insert
+    job = db.query(ProcessingStatus).filter(ProcessingStatus.submission_id == history_value).first()
+    if job is None or job.status not in ACTIVE_STATUSES:
+        record_attached_submissions(history_value)
 
-            webflow_item_id, slug = result
-            webflow_url = f"https://digitaldemocracyproject.org/bills/{slug}"
+    return {
+        "message": "Bill is already being processed. Your submission will be recorded when it finishes.",
+        "status": job.status if job else "processing",
+        "history_value": history_value
+    }, 202
 
-            new_bill.webflow_link = webflow_url
-            new_bill.webflow_item_id = webflow_item_id
-            db.commit()
+def record_attached_submissions(history_value: str):
+    """Record the submissions attached to a bill's job once the bill is stored (the job queue's completion hook)."""
+    db = SessionLocal()
+    try:
+        bill = db.query(Bill).filter(Bill.history == history_value).first()
+        if bill is None:
+            # Failed or not a bill (batches, bulk runs); they wait for the next run
+            return
+        pending = db.query(PendingSubmission).filter(PendingSubmission.submission_id == history_value).all()
+        for submission in pending:
+            # Whoever deletes the row records it, so each is recorded once across workers
+            if not db.query(PendingSubmission).filter(PendingSubmission.id == submission.id).delete():
+                db.rollback()
+                continue
+            record_stance(db, bill, FormRequest.model_validate_json(submission.request))
+            logger.info(f"Recorded attached submission for bill {history_value}")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
-            # Save form data
-            save_form_data(
-                name=request.name,
-                email=request.email,
-                member_organization=request.member_organization,
-                year=request.year,
-                legislation_type="Florida Bills",
-                session="N/A",
-                bill_number=request.bill_number,
-                bill_type=bill_details['govId'].split(" ")[0],
-                support=request.support,
-                govId=bill_details["govId"],
-                db=db
-            )
+def requeue_attached_submissions(history_value: str):
+    """
+    Start the next attempt of a failed job with its oldest attached submission (the job queue's failure hook).
 
-        except Exception as processing_error:
-            logger.error(f"Background processing error: {str(processing_error)}")
-            # The error will be visible in the status endpoint
-            raise
+    The other attached submissions stay attached to the new attempt, so each
+    failure uses up one of them and none is dropped silently.
+    """
+    db = SessionLocal()
+    try:
+        submission = db.query(PendingSubmission).filter(
+            PendingSubmission.submission_id == history_value
+        ).order_by(PendingSubmission.id).first()
+        if submission is None:
+            return
+        request_json, created_at = submission.request, submission.created_at
+        # Taken the same way as in record_attached_submissions
+        if not db.query(PendingSubmission).filter(PendingSubmission.id == submission.id).delete():
+            db.rollback()
+            return
+        db.commit()
 
-        return response
+        request = FormRequest.model_validate_json(request_json)
+        if lookup_stored_bill(db, history_value):
+            job = (update_stored_bill, request, history_value)
+        elif request.legislation_type == "Federal Bills":
+            job = (process_queued_federal_bill, request)
+        else:
+            job = (process_florida_bill, request, history_value)
 
-    except HTTPException as http_exc:
+        try:
+            queued = job_queue.enqueue(history_value, *job)
+        except queue.Full:
+            queued = False
+        if not queued:
+            # Another attempt started meanwhile, or there is no room; wait for the next one
+            db.add(PendingSubmission(submission_id=history_value, request=request_json, created_at=created_at))
+            db.commit()
+            return
+        logger.info(f"Job {history_value} failed, queued again for an attached submission")
+    except Exception:
         db.rollback()
-        logger.error(f"HTTP exception occurred: {http_exc.detail}")
-        raise http_exc
+        raise
+    finally:
+        db.close()
+
+job_queue.on_complete = record_attached_submissions
+job_queue.on_fail = requeue_attached_submissions
+
+# Bulk runs have no submitter, so no form data is recorded
+def process_florida_bill_in_bulk(db: Session, request: FormRequest, history_value: str):
+    return process_florida_bill(db, request, history_value, save_submission=False, report_progress=False)
+
+def run_bulk_ingestion(db: Session, year: int, limit: int = None):
+    db.close()
+    return ingest_session(SessionLocal, year, process_florida_bill_in_bulk, job_queue.set_status, job_queue.claim, limit=limit)
+
+@app.post("/bulk-ingest/{year}")
+async def bulk_ingest(year: int, limit: int = None, db: Session = Depends(get_db)):
+    """Queue ingestion of every bill of a Florida session; progress is at /bill-status/bulk-<year>."""
+    run_id = bulk_submission_id(year)
+    try:
+        if not await run_in_pool("io", job_queue.enqueue, run_id, run_bulk_ingestion, year, limit):
+            return JSONResponse(content={
+                "message": "Bulk ingestion of this session is already running.",
+                "status": "processing",
+                "history_value": run_id
+            }, status_code=202)
+
+        return JSONResponse(content={
+            "message": "Bulk ingestion queued. Bills already stored will be skipped.",
+            "status": "processing",
+            "history_value": run_id
+        }, status_code=202)
+
+    except queue.Full:
+        raise HTTPException(status_code=503, detail="Too many bills are being processed, please try again later")
+    finally:
+        db.close()
+
+@app.post("/update-bill/", response_class=Response)
+async def update_bill(request: FormRequest, db: Session = Depends(get_db)):
+    history_value = f"{request.year}{request.bill_number}"
+    logger.info(f"Starting update-bill() for bill: {history_value}")
+
+    try:
+        content, status_code = await run_in_pool("io", queue_florida_bill, db, request, history_value)
+        return JSONResponse(content=content, status_code=status_code)
+
+    except queue.Full:
+        logger.error(f"Job queue is full, rejecting bill: {history_value}")
+        raise HTTPException(status_code=503, detail="Too many bills are being processed, please try again later")
     except Exception as e:
-        db.rollback()
+        await run_in_pool("io", db.rollback)
         logger.error(f"An error occurred: {str(e)}")
-        if "collection needs to be published" in str(e).lower():
-            raise HTTPException(
-                status_code=409,  # Using 409 to indicate conflict
-                detail=str(e)
-            )
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         db.close()
 
+def lookup_bill_status(db: Session, history_value: str):
+    """Return the processing_status row and bill row for a history value."""
+    job = db.query(ProcessingStatus).filter(ProcessingStatus.submission_id == history_value).first()
+    bill = db.query(Bill).filter(Bill.history == history_value).first()
+    return job, bill
+
+async def lookup_bill_status_async(history_value: str):
+    """lookup_bill_status on the async engine, without a worker thread."""
+    async with async_session_scope() as session:
+        job = (await session.execute(select(ProcessingStatus).where(ProcessingStatus.submission_id == history_value))).scalars().first()
+        bill = (await session.execute(select(Bill).where(Bill.history == history_value))).scalars().first()
+    return job, bill
+
 @app.get("/bill-status/{history_value}")
 async def get_bill_status(history_value: str, db: Session = Depends(get_db)):
     try:
+        if DB_ASYNC_ENABLED:
+            job, bill = await lookup_bill_status_async(history_value)
+        else:
+            job, bill = await run_in_pool("io", lookup_bill_status, db, history_value)
+
+        # Batch groups report on their bills
+        if job and job.members is not None:
+            content = await run_in_pool("io", lookup_batch_status, db, history_value)
+            return JSONResponse(content=content, status_code=202 if content["status"] == "processing" else 200)
+
+        # Queued, running and failed jobs take precedence over the bill row,
+        # as do jobs that don't produce one (bulk runs)
+        if job and (job.status != "completed" or not bill):
+            return JSONResponse(content={
+                "message": job.message,
+                "status": job.status,
+                "history_value": history_value
+            }, status_code=202 if job.status in ACTIVE_STATUSES else 200)
+
         # Check if the bill exists
-        bill = db.query(Bill).filter(Bill.history == history_value).first()
-        
         if not bill:
             return JSONResponse(content={
                 "message": "Bill not found",
@@ -211,104 +520,174 @@ async def get_bill_status(history_value: str, db: Session = Depends(get_db)):
     finally:
         db.close()
 
-def save_form_data(name, email, member_organization, year, legislation_type, session, bill_number, bill_type, support, govId, db: Session):
-    form_data = FormData(
-        name=name,
-        email=email,
-        member_organization=member_organization,
-        year=year,
-        legislation_type=legislation_type,
-        session=session,
-        bill_number=bill_number,
-        bill_type=bill_type,
-        support=support,
-        govId=govId,
-        created_at=datetime.datetime.now()
-    )
-    db.add(form_data)
+@app.get("/cache-stats/")
+async def get_cache_stats():
+    llm_stats = await run_in_pool("io", llm_cache.stats)
+    federal_version_stats = await run_in_pool("io", federal_version_cache.stats)
+    http_stats = await run_in_pool("io", http_cache_stats)
+    return JSONResponse(content={"llm": llm_stats, "federal_versions": federal_version_stats, "http": http_stats}, status_code=200)
+
+@app.get("/db-stats/")
+async def get_db_stats():
+    return JSONResponse(content=pool_stats(), status_code=200)
+
+@app.get("/normalization-stats/")
+async def get_normalization_stats():
+    return JSONResponse(content=normalization_stats(), status_code=200)
+
+def record_stance(db: Session, bill: Bill, request: FormRequest):
+    """Add a submission's organization and position to a stored bill's Webflow item and save its form data."""
+    if request.member_organization and bill.webflow_item_id:
+        # The item is read, merged and written back, so concurrent stances on
+        # one bill are serialized on its row until record_submission commits
+        db.query(Bill).filter(Bill.id == bill.id).with_for_update().first()
+        try:
+            if not webflow_api.add_member_stance(bill.webflow_item_id, request.member_organization, request.support):
+                raise Exception("Failed to update webflow item")
+        except Exception:
+            db.rollback()
+            raise
+    record_submission(db, request, bill.govId)
+
+# Function to record the form data of a submission for a stored bill
+def record_submission(db: Session, request: FormRequest, govId: str):
+    db.add(form_data(request, govId, federal=request.legislation_type == "Federal Bills"))
     db.commit()
 
-@app.post("/process-federal-bill/", response_class=Response)
-async def process_federal_bill(request: FormRequest, db: Session = Depends(get_db)):
-    logger.info(f"Starting process-federal-bill() for bill: {request.bill_number} in session {request.session}")
-    try:
-        # Fetch bill details
-        bill_details = fetch_federal_bill_details(request.session, request.bill_number, request.bill_type)
-        logger.info(f"Obtained federal bill details for: {bill_details['govId']}")
-
-        # Generate summary and PDFs
-        pdf_path, summary, pros, cons = create_federal_bill_summary(
-            bill_details['full_text'],
-            language=request.lan,
-            title=bill_details['title']
-        )
+# Function to store a processed federal bill, its metadata and the submission
+def save_federal_bill(db: Session, request: FormRequest, results, save_submission: bool = True):
+    bill_details = results["details"]
+    summary, pros, cons = results["summary"], results["pros"], results["cons"]
+
+    webflow_item_id, slug = results["webflow"]
+    webflow_url = f"https://digitaldemocracyproject.org/bills/{slug}"
 
-        # Create new bill record
-        new_bill = Bill(
+    save_bill(
+        db,
+        Bill(
             govId=bill_details['govId'],
             billTextPath=bill_details['billTextPath'],
-            history=f"{request.session}{request.bill_type}{request.bill_number}"
-        )
-        db.add(new_bill)
-        db.flush()
-
-        # Add metadata
-        for meta_type, text in [("Summary", summary), ("Pro", pros), ("Con", cons)]:
-            new_meta = BillMeta(billId=new_bill.id, type=meta_type, text=text, language=request.lan)
-            db.add(new_meta)
-        db.commit()
+            history=f"{request.session}{request.bill_type}{request.bill_number}",
+            webflow_link=webflow_url,
+            webflow_item_id=webflow_item_id
+        ),
+        meta_rows(summary, pros, cons, language=request.lan),
+        submission=form_data(request, bill_details["govId"], federal=True) if save_submission else None
+    )
+    return webflow_url
 
-        # Create Kialo discussion
-        logger.info("Running selenium script for federal bill")
-        kialo_url = run_selenium_script(title=bill_details['govId'], summary=summary, pros_text=pros, cons_text=cons)
-        if kialo_url is None:
-            logger.warning("Selenium script failed but continuing")
-
-        # Create Webflow item
-        logger.info("Creating webflow item")
-        result = webflow_api.create_live_collection_item(
-            bill_details['gov-url'],
-            {
-                **bill_details,
-                "description": summary
-            },
-            kialo_url,
-            support_text=request.member_organization if request.support == "Support" else '',
-            oppose_text=request.member_organization if request.support == "Oppose" else '',
-            jurisdiction="US",
-            member_organization=request.member_organization
-        )
+def process_federal_bill_in_bulk(db: Session, request: FormRequest, details):
+    """Run an already parsed federal bill (e.g. from a govinfo archive) through the pipeline and store it"""
+    try:
+        results = run_stages(FEDERAL_CONTENT_STAGES, request=request, webflow_api=webflow_api, webflow_items=WebflowItems(submission_history(request)), details=details)
+        webflow_url = save_federal_bill(db, request, results, save_submission=False)
+        return f"Bill processing completed: {webflow_url}"
+    except Exception:
+        db.rollback()
+        raise
 
-        if result is None:
-            logger.error("Failed to create webflow item")
-            raise HTTPException(status_code=500, detail="Failed to create webflow item")
+def process_queued_federal_bill(db: Session, request: FormRequest):
+    """Run a queued federal submission through the pipeline; no PDF report is rendered."""
+    try:
+        history_value = f"{request.session}{request.bill_type}{request.bill_number}"
+        stored = already_stored(db, request, history_value)
+        if stored:
+            return stored
+        results = run_stages(FEDERAL_DETAILS_STAGES + FEDERAL_CONTENT_STAGES, on_stage=stage_progress(history_value), request=request, webflow_api=webflow_api, webflow_items=WebflowItems(history_value))
+        webflow_url = save_federal_bill(db, request, results)
+        return f"Bill processing completed: {webflow_url}"
+    except Exception:
+        db.rollback()
+        raise
+
+def queue_federal_bill(db: Session, request: FormRequest, history_value: str):
+    """Queue federal processing unless the bill exists or is already being processed; returns (content, status_code)."""
+    existing_bill = db.query(Bill).filter(Bill.history == history_value).first()
+    if existing_bill:
+        record_stance(db, existing_bill, request)
+        return {
+            "message": "Bill already exists. Your stance has been recorded.",
+            "status": "success",
+            "history_value": history_value,
+            "webflow_link": existing_bill.webflow_link
+        }, 200
+
+    if not job_queue.enqueue(history_value, process_queued_federal_bill, request):
+        return attach_submission(db, request, history_value)
+    return {
+        "message": "Request received successfully. Processing will continue in the background.",
+        "status": "processing",
+        "history_value": history_value
+    }, 202
+
+# Function to read a BytesIO buffer in chunks for a StreamingResponse
+def iter_buffer(buffer, chunk_size=64 * 1024):
+    buffer.seek(0)
+    while True:
+        chunk = buffer.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+# Function to render the summary PDF of a stored federal bill from its saved metadata
+def stored_federal_report(db: Session, bill: Bill, language: str):
+    metas = {meta.type: meta.text for meta in db.query(BillMeta).filter(BillMeta.billId == bill.id, BillMeta.language == language)}
+    if not all(metas.get(meta_type) for meta_type in ("Summary", "Pro", "Con")):
+        return None
+    return render_federal_bill_summary(metas["Summary"], metas["Pro"], metas["Con"], language=language, title=bill.govId)
+
+# Function to record a stance on a stored federal bill and answer with its stored report
+def stored_federal_response(db: Session, bill: Bill, request: FormRequest, history_value: str):
+    record_stance(db, bill, request)
+    pdf_buffer = stored_federal_report(db, bill, request.lan)
+    if pdf_buffer is not None:
+        return StreamingResponse(iter_buffer(pdf_buffer), media_type="application/pdf")
+    return JSONResponse(content={
+        "message": "Bill already exists. Your stance has been recorded.",
+        "status": "completed",
+        "history_value": history_value,
+        "webflow_link": bill.webflow_link
+    }, status_code=200)
 
-        webflow_item_id, slug = result
-        webflow_url = f"https://digitaldemocracyproject.org/bills/{slug}"
+@app.post("/process-federal-bill/", response_class=Response)
+async def process_federal_bill(request: FormRequest, db: Session = Depends(get_db)):
+    logger.info(f"Starting process-federal-bill() for bill: {request.bill_number} in session {request.session}")
+    try:
+        # A stored bill is never processed again: record the stance and send
+        # the report of the stored summary instead
+        history_value = submission_history(request)
+        existing_bill = await run_in_pool("io", lookup_stored_bill, db, history_value)
+        if existing_bill:
+            return await run_in_pool("io", stored_federal_response, db, existing_bill, request, history_value)
 
-        new_bill.webflow_link = webflow_url
-        new_bill.webflow_item_id = webflow_item_id
-        db.commit()
+        # The bill's job row is the lock, as for queued submissions
+        if not await run_in_pool("io", job_queue.claim, history_value, "Processing a /process-federal-bill/ request"):
+            return JSONResponse(content={
+                "message": "This bill is already being processed. Submit it through /update-bill/ to have your stance recorded.",
+                "status": "processing",
+                "history_value": history_value
+            }, status_code=409)
 
-        # Save form data
-        save_form_data(
-            name=request.name,
-            email=request.email,
-            member_organization=request.member_organization,
-            year=request.year,
-            legislation_type="Federal Bills",
-            session=request.session,
-            bill_number=request.bill_number,
-            bill_type=request.bill_type,
-            support=request.support,
-            govId=bill_details["govId"],
-            db=db
-        )
+        try:
+            # Stored by a job that finished between the lookup and the claim
+            existing_bill = await run_in_pool("io", lookup_stored_bill, db, history_value)
+            if existing_bill:
+                await run_in_pool("io", job_queue.set_status, history_value, "completed", "Bill already stored")
+                return await run_in_pool("io", stored_federal_response, db, existing_bill, request, history_value)
+
+            await run_in_pool("io", job_queue.set_status, history_value, "processing", "Processing started")
+            results = await run_stages_async(FEDERAL_BILL_STAGES, request=request, webflow_api=webflow_api, webflow_items=WebflowItems(history_value))
+            logger.info(f"Processed federal bill: {results['details']['govId']}")
+            webflow_url = await run_in_pool("io", save_federal_bill, db, request, results)
+            await run_in_pool("io", job_queue.set_status, history_value, "completed", f"Bill processing completed: {webflow_url}")
+        except Exception as e:
+            await run_in_pool("io", job_queue.set_status, history_value, "failed", str(e))
+            raise
+        pdf_buffer = results["report"]
 
-        # Return PDF
-        if pdf_path and os.path.exists(pdf_path):
-            with open(pdf_path, "rb") as pdf_file:
-                return Response(content=pdf_file.read(), media_type="application/pdf")
+        # Stream the PDF straight from the in-memory buffer
+        if pdf_buffer is not None:
+            return StreamingResponse(iter_buffer(pdf_buffer), media_type="application/pdf")
         else:
             raise HTTPException(status_code=500, detail="Failed to generate PDF")
 
@@ -319,4 +698,148 @@ async def process_federal_bill(request: FormRequest, db: Session = Depends(get_d
             "status": "error"
         }, status_code=500)
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Function to build the history value a submission is tracked under
+def submission_history(request: FormRequest):
+    if request.legislation_type == "Federal Bills":
+        return f"{request.session}{request.bill_type}{request.bill_number}"
+    return f"{request.year}{request.bill_number}"
+
+def update_stored_bill(db: Session, request: FormRequest, history_value: str):
+    """Job for a batch submission of a stored bill: record its stance, then refresh the bill if asked."""
+    bill = db.query(Bill).filter(Bill.history == history_value).first()
+    record_stance(db, bill, request)
+    if request.refresh and request.legislation_type != "Federal Bills":
+        return refresh_florida_bill(db, request, history_value)
+    return f"Stance recorded: {bill.webflow_link}"
+
+def queue_stored_bill(db: Session, request: FormRequest, history_value: str):
+    """Queue the stance update of a stored bill, so a batch makes no Webflow calls; returns (content, status_code)."""
+    if not job_queue.enqueue(history_value, update_stored_bill, request, history_value):
+        return attach_submission(db, request, history_value)
+    return {
+        "message": "Bill already exists. Your stance will be recorded in the background.",
+        "status": "queued",
+        "history_value": history_value
+    }, 202
+
+def queue_batch(db: Session, requests: List[FormRequest]):
+    """Queue every distinct bill of a batch as one job group; returns the response content."""
+    # The first submission of a bill wins, later duplicates are dropped
+    unique = {}
+    for request in requests:
+        unique.setdefault(submission_history(request), request)
+
+    batch_id = f"batch-{uuid.uuid4().hex[:12]}"
+    job_queue.create_group(batch_id, unique.keys(), f"{len(unique)} bills submitted")
+
+    bills = []
+    for history_value, request in unique.items():
+        if db.query(Bill).filter(Bill.history == history_value).first():
+            queue_bill = queue_stored_bill
+        else:
+            queue_bill = queue_federal_bill if request.legislation_type == "Federal Bills" else queue_florida_bill
+        try:
+            content, status_code = queue_bill(db, request, history_value)
+        except queue.Full:
+            # enqueue already marked the bill failed
+            content = {
+                "message": "Job queue is full, please try again later",
+                "status": "failed",
+                "history_value": history_value
+            }
+        except Exception as e:
+            # One bill failing doesn't stop the rest of the batch
+            db.rollback()
+            logger.error(f"Could not queue {history_value} of {batch_id}: {str(e)}")
+            content = {
+                "message": f"Could not queue the bill: {str(e)}",
+                "status": "failed",
+                "history_value": history_value
+            }
+        bills.append(content)
+
+    return {
+        "message": "Batch received. Progress is available from the batch status endpoint.",
+        "batch_id": batch_id,
+        "duplicates": len(requests) - len(unique),
+        "bills": bills
+    }
+
+def lookup_batch_status(db: Session, batch_id: str):
+    """Return the per-bill status of a batch group, or None if there is no such batch."""
+    group = db.query(ProcessingStatus).filter(ProcessingStatus.submission_id == batch_id).first()
+    if group is None or group.members is None:
+        return None
+
+    members = json.loads(group.members)
+    jobs = {job.submission_id: job for job in db.query(ProcessingStatus).filter(ProcessingStatus.submission_id.in_(members))}
+    bills = {bill.history: bill for bill in db.query(Bill).filter(Bill.history.in_(members))}
+
+    # Same precedence as /bill-status/: an unfinished job wins over the bill row
+    items = []
+    for history_value in members:
+        job, bill = jobs.get(history_value), bills.get(history_value)
+        if job and (job.status != "completed" or not bill):
+            items.append({"history_value": history_value, "status": job.status, "message": job.message})
+        elif bill:
+            items.append({"history_value": history_value, "status": "completed", "message": "Bill processing completed", "webflow_link": bill.webflow_link})
+        else:
+            items.append({"history_value": history_value, "status": "not_found", "message": "Bill not found"})
+
+    counts = Counter(item["status"] for item in items)
+    if any(counts[status] for status in ACTIVE_STATUSES):
+        status = "processing"
+    elif counts["completed"] == 0 and items:
+        status = "failed"
+    else:
+        status = "completed"
+
+    return {
+        "batch_id": batch_id,
+        "status": status,
+        "total": len(items),
+        "progress": dict(counts),
+        "created_at": group.created_at.isoformat() if group.created_at else None,
+        "bills": items
+    }
+
+@app.post("/batch-bills/")
+async def submit_batch(requests: List[FormRequest], db: Session = Depends(get_db)):
+    """Queue up to BATCH_MAX_BILLS Florida and federal submissions at once; progress is at /batch-status/{batch_id}."""
+    if not requests:
+        raise HTTPException(status_code=400, detail="The batch is empty")
+    if len(requests) > BATCH_MAX_BILLS:
+        raise HTTPException(status_code=400, detail=f"A batch can hold at most {BATCH_MAX_BILLS} bills")
+
+    try:
+        content = await run_in_pool("io", queue_batch, db, requests)
+        logger.info(f"Queued batch {content['batch_id']} with {len(content['bills'])} bills")
+        return JSONResponse(content=content, status_code=202)
+    except Exception as e:
+        await run_in_pool("io", db.rollback)
+        logger.error(f"An error occurred: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        db.close()
+
+@app.get("/batch-status/{batch_id}")
+async def get_batch_status(batch_id: str, db: Session = Depends(get_db)):
+    try:
+        content = await run_in_pool("io", lookup_batch_status, db, batch_id)
+        if content is None:
+            return JSONResponse(content={
+                "message": "Batch not found",
+                "status": "not_found"
+            }, status_code=404)
+        return JSONResponse(content=content, status_code=202 if content["status"] == "processing" else 200)
+
+    except Exception as e:
+        logger.error(f"Error fetching batch status: {str(e)}")
+        return JSONResponse(content={
+            "message": "Error fetching status",
+            "status": "error"
+        }, status_code=500)
+    finally:
+        db.close()
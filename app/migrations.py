@@ -0,0 +1,245 @@
+import os
+import sys
+import logging
+import datetime
+from sqlalchemy import (
+    MetaData, Table, Column, String, Text, BIGINT, DateTime, Enum, ForeignKey, Index, inspect, text
+)
+from .models import Base
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# What to do at startup when the database doesn't match the models:
+# "warn" logs the differences, "strict" refuses to start, "off" skips the check
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "warn").lower()
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+# MySQL commits every DDL statement on its own, so a migration that stopped
+# half way can't be rolled back. The helpers below only change what is
+# missing, which makes running a migration again safe.
+
+def _has_column(conn, table, column):
+    return column in [col["name"] for col in inspect(conn).get_columns(table)]
+
+def _has_index(conn, table, name):
+    inspector = inspect(conn)
+    names = [index["name"] for index in inspector.get_indexes(table)]
+    names += [constraint["name"] for constraint in inspector.get_unique_constraints(table)]
+    return name in names
+
+def _add_column(conn, table, column):
+    if not _has_column(conn, table, column.name):
+        column_type = column.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column.name} {column_type}"))
+
+def _create_index(conn, table, name, columns, unique=False):
+    if not _has_index(conn, table.name, name):
+        Index(name, *[table.c[column] for column in columns], unique=unique).create(conn)
+
+def _reflect(conn, name):
+    return Table(name, MetaData(), autoload_with=conn)
+
+# Migrations, oldest first. Each runs once and is recorded in schema_migrations;
+# add new ones at the end and never change one that has been applied.
+
+def create_base_tables(conn):
+    # The tables as they were before migrations were introduced; existing
+    # databases already have them
+    metadata = MetaData()
+    Table(
+        "bill", metadata,
+        Column("id", BIGINT, primary_key=True, autoincrement=True),
+        Column("govId", String(10)),
+        Column("billTextPath", String(255)),
+        Column("history", String(255)),
+        Column("webflow_link", String(255)),
+        Column("webflow_item_id", String(255)),
+    )
+    Table(
+        "bill_meta", metadata,
+        Column("id", BIGINT, primary_key=True, autoincrement=True),
+        Column("billId", BIGINT, ForeignKey("bill.id")),
+        Column("type", Enum("Pro", "Con", "Summary", name="meta_type")),
+        Column("text", Text),
+        Column("language", String(2)),
+    )
+    Table(
+        "form_data", metadata,
+        Column("id", BIGINT, primary_key=True, autoincrement=True),
+        Column("name", String(255)),
+        Column("email", String(255)),
+        Column("member_organization", String(255)),
+        Column("year", String(4)),
+        Column("legislation_type", String(50)),
+        Column("session", String(10)),
+        Column("bill_number", String(50)),
+        Column("bill_type", String(50)),
+        Column("support", String(10)),
+        Column("govId", String(50)),
+        Column("created_at", DateTime),
+    )
+    Table(
+        "processing_status", metadata,
+        Column("id", BIGINT, primary_key=True, autoincrement=True),
+        Column("submission_id", String(50), unique=True, nullable=False),
+        Column("status", String(20)),
+        Column("message", Text),
+        Column("created_at", DateTime),
+        Column("updated_at", DateTime),
+    )
+    metadata.create_all(conn, checkfirst=True)
+
+def add_bill_versions(conn):
+    metadata = MetaData()
+    Table("bill", metadata, autoload_with=conn)
+    bill_version = Table(
+        "bill_version", metadata,
+        Column("id", BIGINT, primary_key=True, autoincrement=True),
+        Column("billId", BIGINT, ForeignKey("bill.id")),
+        Column("fingerprint", String(64)),
+        Column("title", String(255)),
+        Column("source_url", String(255)),
+        Column("billTextPath", String(255)),
+        Column("categories", Text),
+        Column("text", Text(16777215)),
+        Column("created_at", DateTime),
+    )
+    bill_version.create(conn, checkfirst=True)
+    _add_column(conn, "bill_version", Column("text", Text(16777215)))
+
+def add_batch_groups(conn):
+    _add_column(conn, "processing_status", Column("members", Text))
+
+def add_pending_submissions(conn):
+    Table(
+        "pending_submission", MetaData(),
+        Column("id", BIGINT, primary_key=True, autoincrement=True),
+        Column("submission_id", String(50), nullable=False),
+        Column("request", Text),
+        Column("created_at", DateTime),
+    ).create(conn, checkfirst=True)
+
+def add_lookup_indexes(conn):
+    duplicates = conn.execute(text(
+        "SELECT history, COUNT(*) FROM bill WHERE history IS NOT NULL GROUP BY history HAVING COUNT(*) > 1"
+    )).fetchall()
+    if duplicates:
+        listed = ", ".join(f"{history} ({count} rows)" for history, count in duplicates[:20])
+        raise RuntimeError(
+            f"Cannot add a unique index on bill.history, these history values have more than one bill: {listed}. "
+            "Remove or merge the duplicates and run the migrations again."
+        )
+
+    _create_index(conn, _reflect(conn, "bill"), "ix_bill_history", ["history"], unique=True)
+    _create_index(conn, _reflect(conn, "bill_meta"), "ix_bill_meta_bill_language_type", ["billId", "language", "type"])
+    _create_index(conn, _reflect(conn, "bill_version"), "ix_bill_version_bill_id", ["billId", "id"])
+    _create_index(conn, _reflect(conn, "form_data"), "ix_form_data_gov_id_created", ["govId", "created_at"])
+    _create_index(conn, _reflect(conn, "processing_status"), "ix_processing_status_status_updated", ["status", "updated_at"])
+    _create_index(conn, _reflect(conn, "pending_submission"), "ix_pending_submission_submission_id", ["submission_id"])
+
+def add_job_owners(conn):
+    _add_column(conn, "processing_status", Column("owner", String(100)))
+
+def add_webflow_checkpoints(conn):
+    _add_column(conn, "processing_status", Column("webflow_item_id", String(255)))
+    _add_column(conn, "processing_status", Column("webflow_slug", String(255)))
+
+MIGRATIONS = [
+    ("0000", "Base tables: bill, bill_meta, form_data, processing_status", create_base_tables),
+    ("0001", "bill_version table for version-aware refresh", add_bill_versions),
+    ("0002", "processing_status.members for batch groups", add_batch_groups),
+    ("0003", "pending_submission table for coalesced submissions", add_pending_submissions),
+    ("0004", "Unique index on bill.history and lookup indexes", add_lookup_indexes),
+    ("0005", "processing_status.owner for restart recovery", add_job_owners),
+    ("0006", "processing_status Webflow item of a job, reused on retry", add_webflow_checkpoints),
+]
+
+migrations_table = Table(
+    MIGRATIONS_TABLE, MetaData(),
+    Column("version", String(50), primary_key=True),
+    Column("description", String(255)),
+    Column("applied_at", DateTime),
+)
+
+def applied_versions(conn):
+    if not inspect(conn).has_table(MIGRATIONS_TABLE):
+        return set()
+    return {row.version for row in conn.execute(migrations_table.select())}
+
+def migrate(engine):
+    """Apply the migrations that haven't run yet; returns their versions."""
+    with engine.begin() as conn:
+        migrations_table.create(conn, checkfirst=True)
+        done = applied_versions(conn)
+
+    applied = []
+    for version, description, migration in MIGRATIONS:
+        if version in done:
+            continue
+        logger.info(f"Applying migration {version}: {description}")
+        with engine.begin() as conn:
+            migration(conn)
+            conn.execute(migrations_table.insert().values(
+                version=version, description=description, applied_at=datetime.datetime.now()
+            ))
+        applied.append(version)
+    return applied
+
+def schema_problems(engine):
+    """Differences between the database and the models: pending migrations, missing tables, columns and indexes."""
+    problems = []
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+        problems += [f"migration {version} not applied ({description})" for version, description, migration in MIGRATIONS if version not in done]
+
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                problems.append(f"table {table.name} is missing")
+                continue
+            columns = {col["name"] for col in inspector.get_columns(table.name)}
+            problems += [f"column {table.name}.{col.name} is missing" for col in table.columns if col.name not in columns]
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            indexes |= {constraint["name"] for constraint in inspector.get_unique_constraints(table.name)}
+            problems += [f"index {index.name} on {table.name} is missing" for index in table.indexes if index.name not in indexes]
+    return problems
+
+def check_schema(engine):
+    """Startup check that the database matches the models, as configured by SCHEMA_CHECK."""
+    if SCHEMA_CHECK == "off":
+        return
+    try:
+        problems = schema_problems(engine)
+    except Exception as e:
+        logger.error(f"Schema check failed: {str(e)}")
+        if SCHEMA_CHECK == "strict":
+            raise
+        return
+
+    if not problems:
+        logger.info("Database schema matches the models")
+        return
+    message = "Database schema does not match the models (run python -m app.migrations): " + "; ".join(problems)
+    if SCHEMA_CHECK == "strict":
+        raise RuntimeError(message)
+    logger.warning(message)
+
+# Command line entry point: python -m app.migrations [--check]
+def main(argv):
+    from .db import engine
+
+    logging.basicConfig(level=logging.INFO)
+    if "--check" in argv:
+        problems = schema_problems(engine)
+        for problem in problems:
+            print(problem)
+        print("Schema is up to date" if not problems else f"{len(problems)} problems found")
+        sys.exit(1 if problems else 0)
+
+    applied = migrate(engine)
+    print(f"Applied migrations: {', '.join(applied)}" if applied else "No migrations to apply")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
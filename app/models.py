@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Text, BIGINT, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Text, BIGINT, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from pydantic import BaseModel as PydanticBaseModel
@@ -22,10 +22,16 @@ class FormRequest(PydanticBaseModel):
     bill_type: str
     support: str
     lan: str  # Add this line to include the language field
+    refresh: bool = False  # Reprocess an existing bill if its text changed
 
 # SQLAlchemy models
+# Indexes are created by the migrations in migrations.py; keep the two in step
+
 class Bill(Base):
     __tablename__ = 'bill'
+    __table_args__ = (
+        Index('ix_bill_history', 'history', unique=True),
+    )
 
     id = Column(BIGINT, primary_key=True, autoincrement=True)
     govId = Column(String(10))
@@ -36,6 +42,9 @@ class Bill(Base):
 
 class BillMeta(Base):
     __tablename__ = 'bill_meta'
+    __table_args__ = (
+        Index('ix_bill_meta_bill_language_type', 'billId', 'language', 'type'),
+    )
 
     id = Column(BIGINT, primary_key=True, autoincrement=True)
     billId = Column(BIGINT, ForeignKey('bill.id'))
@@ -46,8 +55,29 @@ class BillMeta(Base):
     # Relationship to link back to the bill
     bill = relationship("Bill")
 
+class BillVersion(Base):
+    __tablename__ = 'bill_version'
+    __table_args__ = (
+        Index('ix_bill_version_bill_id', 'billId', 'id'),
+    )
+
+    id = Column(BIGINT, primary_key=True, autoincrement=True)
+    billId = Column(BIGINT, ForeignKey('bill.id'))
+    fingerprint = Column(String(64))  # SHA-256 of the normalized bill text
+    title = Column(String(255))
+    source_url = Column(String(255))
+    billTextPath = Column(String(255))
+    categories = Column(Text)  # JSON list of Webflow category IDs
+    text = Column(Text(16777215))  # Normalized text, diffed against the next version
+    created_at = Column(DateTime, default=datetime.datetime.now)
+
+    bill = relationship("Bill")
+
 class FormData(Base):
     __tablename__ = 'form_data'
+    __table_args__ = (
+        Index('ix_form_data_gov_id_created', 'govId', 'created_at'),
+    )
 
     id = Column(BIGINT, primary_key=True, autoincrement=True)
     name = Column(String(255))
@@ -64,10 +94,28 @@ class FormData(Base):
 
 class ProcessingStatus(Base):
     __tablename__ = 'processing_status'
+    __table_args__ = (
+        Index('ix_processing_status_status_updated', 'status', 'updated_at'),
+    )
 
     id = Column(BIGINT, primary_key=True, autoincrement=True)
     submission_id = Column(String(50), unique=True, nullable=False)
     status = Column(String(20))  # queued, processing, completed, failed
     message = Column(Text)
+    members = Column(Text)  # JSON list of submission ids, for batch groups
+    owner = Column(String(100))  # JOB_WORKER_ID of the process that claimed the job
+    webflow_item_id = Column(String(255))  # Webflow item created by the job, reused by a retry
+    webflow_slug = Column(String(255))
     created_at = Column(DateTime, default=datetime.datetime.now)
     updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+
+class PendingSubmission(Base):
+    __tablename__ = 'pending_submission'
+    __table_args__ = (
+        Index('ix_pending_submission_submission_id', 'submission_id'),
+    )
+
+    id = Column(BIGINT, primary_key=True, autoincrement=True)
+    submission_id = Column(String(50), nullable=False)  # history value of the job it waits on
+    request = Column(Text)  # FormRequest as JSON
+    created_at = Column(DateTime, default=datetime.datetime.now)
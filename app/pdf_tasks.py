@@ -0,0 +1,57 @@
+import io
+import fitz  # PyMuPDF
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from .text_normalizer import extract_underlined_text
+
+# CPU-bound PDF work, run in the worker processes started by executors.start_pools.
+# Everything here takes and returns plain bytes and strings so it can cross the
+# process boundary; keep imports light, each worker imports this module.
+
+def _open_pdf(data=None, path=None):
+    if data is not None:
+        return fitz.open(stream=data, filetype="pdf")
+    return fitz.open(path)
+
+# Function to extract the text of each page of a PDF
+def extract_pages(data=None, path=None):
+    with _open_pdf(data, path) as pdf:
+        return [page.get_text() for page in pdf]
+
+# Function to extract only the underlined (added) text of a bill PDF
+def extract_added_text(data=None, path=None):
+    with _open_pdf(data, path) as pdf:
+        return extract_underlined_text(pdf)
+
+# Function to render a summary PDF and return its bytes
+def render_summary_pdf_bytes(title, summary, pros, cons, summary_label="Summary", cons_label="Cons"):
+    width, height = letter
+    styles = getSampleStyleSheet()
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    story = []
+
+    story.append(Paragraph(title, styles['Title']))
+    story.append(Spacer(1, 12))
+
+    story.append(Paragraph(f"<b>{summary_label}:</b><br/>{summary}", styles['Normal']))
+    story.append(Spacer(1, 12))
+
+    data = [[cons_label, 'Pros'], [Paragraph(cons, styles['Normal']), Paragraph(pros, styles['Normal'])]]
+    col_widths = [width * 0.45, width * 0.45]
+    t = Table(data, colWidths=col_widths)
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
+        ('BOX', (0, 0), (-1, -1), 0.25, colors.black),
+    ]))
+    story.append(t)
+
+    doc.build(story)
+
+    return buffer.getvalue()
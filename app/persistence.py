@@ -0,0 +1,56 @@
+import logging
+import datetime
+from sqlalchemy import insert
+from .models import BillMeta, FormData
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Function to build the BillMeta rows of one language
+def meta_rows(summary, pros, cons, language="EN"):
+    return [
+        {"type": "Summary", "text": summary, "language": language},
+        {"type": "Pro", "text": pros, "language": language},
+        {"type": "Con", "text": cons, "language": language},
+    ]
+
+# Function to build the form_data row of a submission for a bill
+def form_data(request, govId, federal=False):
+    return FormData(
+        name=request.name,
+        email=request.email,
+        member_organization=request.member_organization,
+        year=request.year,
+        legislation_type="Federal Bills" if federal else "Florida Bills",
+        session=request.session if federal else "N/A",
+        bill_number=request.bill_number,
+        bill_type=request.bill_type if federal else govId.split(" ")[0],
+        support=request.support,
+        govId=govId,
+        created_at=datetime.datetime.now()
+    )
+
+def save_bill(db, bill, metas, version=None, submission=None):
+    """
+    Store a processed bill in one transaction and return it.
+
+    The bill row, its metadata rows for every language (one multi-row
+    insert), its text version and the submission's form data are committed
+    together, so a failure leaves nothing behind.
+    """
+    try:
+        db.add(bill)
+        db.flush()  # assigns bill.id
+        if metas:
+            db.execute(insert(BillMeta), [{**meta, "billId": bill.id} for meta in metas])
+        if version is not None:
+            version.billId = bill.id
+            db.add(version)
+        if submission is not None:
+            db.add(submission)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info(f"Stored bill {bill.history} with {len(metas)} metadata rows")
+    return bill
@@ -0,0 +1,225 @@
+import hashlib
+import logging
+from .stages import Stage
+from .bill_processing import (
+    fetch_bill_page, fetch_pdf_document, upload_document_to_s3, s3_file_name, get_top_categories,
+    full_summarize_with_openai_chat, full_summarize_with_openai_chat_spanish,
+    generate_pros, generate_cons, generate_pros_spanish, generate_cons_spanish,
+    fetch_federal_bill_details, render_federal_bill_summary, try_generate_bill_analysis,
+    try_generate_amended_analysis,
+    condense_bill_text
+)
+from .selenium_script import run_selenium_script
+from .text_normalizer import normalize_pages, NORMALIZE_BILL_TEXT, BILL_TEXT_ADDED_ONLY
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+BUCKET_NAME = "ddp-bills-2"
+
+# Florida bill stages. Inputs: bill_url, request, webflow_api, webflow_items
+
+def page_stage(bill_url):
+    page = fetch_bill_page(bill_url)
+    if not page["govId"] or not page["pdf_url"]:
+        raise Exception("Required bill details are missing")
+    return page
+
+def document_stage(page):
+    return fetch_pdf_document(page["pdf_url"])
+
+def upload_stage(page, document):
+    return upload_document_to_s3(BUCKET_NAME, document, s3_file_name(page["govId"], "pdf"))
+
+def clean_pages_stage(document):
+    pages = document.pages
+    if BILL_TEXT_ADDED_ONLY:
+        if document.added_text.strip():
+            pages = [document.added_text]
+        else:
+            logger.info("No underlined text found, using the full bill text")
+    if NORMALIZE_BILL_TEXT:
+        pages, report = normalize_pages(pages)
+    return pages
+
+def fingerprint_stage(clean_pages):
+    # Taken after normalization so layout-only changes don't count as a new version
+    return hashlib.sha256("\n".join(clean_pages).encode("utf-8")).hexdigest()
+
+def prompt_text_stage(clean_pages):
+    return condense_bill_text("\n".join(clean_pages), pages=clean_pages)
+
+def analysis_stage(prompt_text):
+    return try_generate_bill_analysis(prompt_text)
+
+# The per-field stages only call the model when the combined analysis is unavailable
+
+def categories_stage(prompt_text, analysis):
+    categories = analysis["categories"] if analysis else get_top_categories(prompt_text)
+    logger.info(f"Assigned categories: {categories}")
+    return categories
+
+def summary_stage(prompt_text, analysis):
+    return analysis["summary"] if analysis else full_summarize_with_openai_chat(prompt_text)
+
+def pros_stage(prompt_text, analysis):
+    return analysis["pros"] if analysis else generate_pros(prompt_text)
+
+def cons_stage(prompt_text, analysis):
+    return analysis["cons"] if analysis else generate_cons(prompt_text)
+
+def kialo_stage(page, summary, pros, cons):
+    kialo_url = run_selenium_script(title=page["govId"], summary=summary, pros_text=pros, cons_text=cons)
+    if kialo_url is None:
+        logger.warning("Selenium script failed but continuing")
+    return kialo_url
+
+def create_webflow_item_once(webflow_items, create):
+    """
+    Create the bill's Webflow item, or reuse the one an earlier attempt created.
+
+    The bill row is only written after the item exists, so a job that failed
+    or crashed in between would otherwise publish a duplicate on retry.
+    webflow_items remembers the (item id, slug) of a job; it may be None.
+    """
+    item = webflow_items.get() if webflow_items else None
+    if item:
+        logger.info(f"Reusing webflow item {item[0]} created by an earlier attempt")
+        return item
+    logger.info("Creating webflow item")
+    result = create()
+    if result is not None and webflow_items:
+        webflow_items.set(result)
+    return result
+
+def webflow_stage(request, webflow_api, webflow_items, page, upload, categories, kialo):
+    bill_details = {**page, "billTextPath": upload, "categories": categories}
+    result = create_webflow_item_once(webflow_items, lambda: webflow_api.create_live_collection_item(
+        bill_url=page["gov-url"],
+        bill_details=bill_details,
+        kialo_url=kialo,
+        support_text=request.member_organization if request.support == "Support" else '',
+        oppose_text=request.member_organization if request.support == "Oppose" else '',
+        jurisdiction="FL",
+        member_organization=request.member_organization
+    ))
+    if result is None:
+        logger.error("Failed to create webflow item")
+        raise Exception("Failed to create webflow item. Please ensure all Webflow collection changes are published.")
+    return result
+
+# Enough to tell whether the bill text changed. Inputs: bill_url
+FLORIDA_FINGERPRINT_STAGES = [
+    Stage("page", page_stage, requires=["bill_url"]),
+    Stage("document", document_stage, requires=["page"]),
+    Stage("clean_pages", clean_pages_stage, requires=["document"], pool="cpu"),
+    Stage("fingerprint", fingerprint_stage, requires=["clean_pages"]),
+]
+
+# Everything generated from the bill text. Inputs: page, document, clean_pages
+FLORIDA_CONTENT_STAGES = [
+    Stage("upload", upload_stage, requires=["page", "document"]),
+    Stage("prompt_text", prompt_text_stage, requires=["clean_pages"]),
+    Stage("analysis", analysis_stage, requires=["prompt_text"]),
+    Stage("categories", categories_stage, requires=["prompt_text", "analysis"]),
+    Stage("summary", summary_stage, requires=["prompt_text", "analysis"]),
+    Stage("pros", pros_stage, requires=["prompt_text", "analysis"]),
+    Stage("cons", cons_stage, requires=["prompt_text", "analysis"]),
+]
+
+def amended_analysis_stage(hunks, previous):
+    return try_generate_amended_analysis(hunks, previous)
+
+# Updated content from the changes since the previous version.
+# Inputs: page, document, hunks, previous (summary, pros and cons)
+FLORIDA_AMENDMENT_STAGES = [
+    Stage("upload", upload_stage, requires=["page", "document"]),
+    Stage("amended_analysis", amended_analysis_stage, requires=["hunks", "previous"]),
+]
+
+FLORIDA_BILL_STAGES = FLORIDA_FINGERPRINT_STAGES + FLORIDA_CONTENT_STAGES + [
+    Stage("kialo", kialo_stage, requires=["page", "summary", "pros", "cons"], pool="browser", optional=True),
+    Stage("webflow", webflow_stage, requires=["request", "webflow_api", "webflow_items", "page", "upload", "categories", "kialo"]),
+]
+
+# Federal bill stages. Inputs: request, webflow_api, webflow_items
+
+def federal_details_stage(request):
+    return fetch_federal_bill_details(request.session, request.bill_number, request.bill_type)
+
+def federal_prompt_text_stage(details):
+    # Sections are the chunk boundaries for map-reduce, as pages are for Florida bills
+    units = details["bill_text"].units()
+    if NORMALIZE_BILL_TEXT:
+        units, report = normalize_pages(units)
+    return condense_bill_text("\n".join(units), pages=units, jurisdiction="the US Congress")
+
+def federal_analysis_stage(request, prompt_text):
+    return try_generate_bill_analysis(prompt_text, language=request.lan)
+
+def federal_summary_stage(request, prompt_text, analysis):
+    if analysis:
+        return analysis["summary"]
+    if request.lan.upper() == "ES":
+        return full_summarize_with_openai_chat_spanish(prompt_text)
+    return full_summarize_with_openai_chat(prompt_text)
+
+def federal_pros_stage(request, prompt_text, analysis):
+    if analysis:
+        return analysis["pros"]
+    if request.lan.upper() == "ES":
+        return generate_pros_spanish(prompt_text)
+    return generate_pros(prompt_text)
+
+def federal_cons_stage(request, prompt_text, analysis):
+    if analysis:
+        return analysis["cons"]
+    if request.lan.upper() == "ES":
+        return generate_cons_spanish(prompt_text)
+    return generate_cons(prompt_text)
+
+def federal_report_stage(request, details, summary, pros, cons):
+    return render_federal_bill_summary(summary, pros, cons, language=request.lan, title=details["title"])
+
+def federal_kialo_stage(details, summary, pros, cons):
+    kialo_url = run_selenium_script(title=details["govId"], summary=summary, pros_text=pros, cons_text=cons)
+    if kialo_url is None:
+        logger.warning("Selenium script failed but continuing")
+    return kialo_url
+
+def federal_webflow_stage(request, webflow_api, webflow_items, details, summary, kialo):
+    result = create_webflow_item_once(webflow_items, lambda: webflow_api.create_live_collection_item(
+        details['gov-url'],
+        {
+            **details,
+            "description": summary
+        },
+        kialo,
+        support_text=request.member_organization if request.support == "Support" else '',
+        oppose_text=request.member_organization if request.support == "Oppose" else '',
+        jurisdiction="US",
+        member_organization=request.member_organization
+    ))
+    if result is None:
+        logger.error("Failed to create webflow item")
+        raise Exception("Failed to create webflow item")
+    return result
+
+# Everything after the bill text is known. Inputs: request, webflow_api, webflow_items, details
+FEDERAL_CONTENT_STAGES = [
+    Stage("prompt_text", federal_prompt_text_stage, requires=["details"]),
+    Stage("analysis", federal_analysis_stage, requires=["request", "prompt_text"]),
+    Stage("summary", federal_summary_stage, requires=["request", "prompt_text", "analysis"]),
+    Stage("pros", federal_pros_stage, requires=["request", "prompt_text", "analysis"]),
+    Stage("cons", federal_cons_stage, requires=["request", "prompt_text", "analysis"]),
+    Stage("kialo", federal_kialo_stage, requires=["details", "summary", "pros", "cons"], pool="browser", optional=True),
+    Stage("webflow", federal_webflow_stage, requires=["request", "webflow_api", "webflow_items", "details", "summary", "kialo"]),
+]
+
+FEDERAL_DETAILS_STAGES = [
+    Stage("details", federal_details_stage, requires=["request"]),
+]
+
+FEDERAL_BILL_STAGES = FEDERAL_DETAILS_STAGES + [
+    Stage("report", federal_report_stage, requires=["request", "details", "summary", "pros", "cons"], pool="cpu"),
+] + FEDERAL_CONTENT_STAGES
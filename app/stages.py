@@ -0,0 +1,134 @@
+import time
+import asyncio
+import logging
+from concurrent.futures import wait, FIRST_COMPLETED
+from .executors import submit
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class Stage:
+    """
+    One step of a bill pipeline.
+
+    func is called with one keyword argument per name in requires, each bound
+    to the result of that stage (or to a pipeline input of the same name), and
+    runs on the named executor pool. An optional stage that fails yields None
+    instead of failing the pipeline.
+    """
+
+    def __init__(self, name, func, requires=(), pool="io", optional=False):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.pool = pool
+        self.optional = optional
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, requires={list(self.requires)!r}, pool={self.pool!r})"
+
+def validate_stages(stages, inputs):
+    """Check that every requirement is satisfiable and the graph has no cycles."""
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names: {names}")
+    known = set(inputs)
+    remaining = list(stages)
+    while remaining:
+        ready = [stage for stage in remaining if set(stage.requires) <= known]
+        if not ready:
+            missing = {stage.name: sorted(set(stage.requires) - known) for stage in remaining}
+            raise ValueError(f"Unsatisfiable or cyclic stage requirements: {missing}")
+        for stage in ready:
+            known.add(stage.name)
+            remaining.remove(stage)
+
+def _ready_stages(pending, results):
+    return [stage for stage in pending if all(name in results for name in stage.requires)]
+
+def _arguments(stage, results):
+    return {name: results[name] for name in stage.requires}
+
+def _call(stage, arguments):
+    start_time = time.time()
+    value = stage.func(**arguments)
+    logger.info(f"Stage '{stage.name}' finished in {time.time() - start_time:.2f}s")
+    return value
+
+def _stage_failed(stage, error, results):
+    if stage.optional:
+        logger.warning(f"Optional stage '{stage.name}' failed, continuing: {str(error)}")
+        results[stage.name] = None
+        return
+    logger.error(f"Stage '{stage.name}' failed: {str(error)}")
+    raise error
+
+def _report(on_stage, stage):
+    if on_stage is None:
+        return
+    try:
+        on_stage(stage.name)
+    except Exception as e:
+        logger.warning(f"Progress callback failed after stage '{stage.name}': {str(e)}")
+
+def run_stages(stages, on_stage=None, **inputs):
+    """
+    Run stages with as much parallelism as their requirements allow.
+
+    Blocks the calling thread, which must not be a worker of any pool the
+    stages run on. Returns a dict of inputs and stage results by name.
+    on_stage(name) is called after each stage succeeds.
+    """
+    validate_stages(stages, inputs)
+    results = dict(inputs)
+    pending = list(stages)
+    running = {}
+
+    try:
+        while pending or running:
+            for stage in _ready_stages(pending, results):
+                pending.remove(stage)
+                running[submit(stage.pool, _call, stage, _arguments(stage, results))] = stage
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    results[stage.name] = future.result()
+                except Exception as e:
+                    _stage_failed(stage, e, results)
+                    continue
+                _report(on_stage, stage)
+    finally:
+        for future in running:
+            future.cancel()
+
+    return results
+
+async def run_stages_async(stages, on_stage=None, **inputs):
+    """Event-loop variant of run_stages for use inside async endpoints."""
+    validate_stages(stages, inputs)
+    results = dict(inputs)
+    pending = list(stages)
+    running = {}
+
+    try:
+        while pending or running:
+            for stage in _ready_stages(pending, results):
+                pending.remove(stage)
+                running[asyncio.wrap_future(submit(stage.pool, _call, stage, _arguments(stage, results)))] = stage
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    results[stage.name] = future.result()
+                except Exception as e:
+                    _stage_failed(stage, e, results)
+                    continue
+                _report(on_stage, stage)
+    finally:
+        for future in running:
+            future.cancel()
+
+    return results
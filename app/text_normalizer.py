@@ -0,0 +1,133 @@
+import os
+import re
+import logging
+import threading
+from .chunking import estimate_tokens
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Strip layout noise before prompting; optionally keep only underlined (added) text
+NORMALIZE_BILL_TEXT = os.getenv("NORMALIZE_BILL_TEXT", "true").lower() == "true"
+BILL_TEXT_ADDED_ONLY = os.getenv("BILL_TEXT_ADDED_ONLY", "false").lower() == "true"
+
+# Lines that are layout noise in Florida Senate and House bill PDFs
+BOILERPLATE_PATTERNS = [
+    re.compile(r'^\d{1,4}$'),  # line numbers
+    re.compile(r'^Florida Senate\s*-\s*\d{4}\b.*$', re.IGNORECASE),  # Senate page header
+    re.compile(r'^F\s?L\s?O\s?R\s?I\s?D\s?A\s+H\s?O\s?U\s?S\s?E\s+O\s?F\s+R\s?E\s?P.*$'),  # House page header
+    re.compile(r'^CODING:.*$', re.IGNORECASE),  # strike/underline legend
+    re.compile(r'^words underlined are additions\.?$', re.IGNORECASE),
+    re.compile(r'^Page \d+ of \d+.*$', re.IGNORECASE),
+    re.compile(r'^(?:CS/)*(?:SB|HB|SJR|HJR|SR|HR|SM|HM|SCR|HCR|SPB|PCB)\s+\d+(?:\s+\d{4})?$'),  # repeated bill ID
+    re.compile(r'^(?:\d{2,3}-\d{5}[A-Z]?-\d{2}|\d{8}(?:__|[a-z]\d))(?:\s+(?:\d{2,3}-\d{5}[A-Z]?-\d{2}|\d{8}(?:__|[a-z]\d)))?$'),  # drafting codes
+    re.compile(r'^[a-z]{2,4}\d{4}(?:-\d{2}|-[a-z]\d)+$'),  # House file codes
+]
+
+# Line numbers printed in the left margin on the same line as the text
+LEADING_LINE_NUMBER = re.compile(r'^\d{1,4}\s{2,}')
+
+_stats_lock = threading.Lock()
+_stats = {"documents": 0, "original_tokens": 0, "normalized_tokens": 0}
+
+def _is_boilerplate(line):
+    return any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS)
+
+def _normalize(text):
+    lines = []
+    removed_lines = 0
+    for raw_line in text.splitlines():
+        line = LEADING_LINE_NUMBER.sub('', raw_line.strip())
+        line = re.sub(r'[ \t\u00a0]+', ' ', line).strip()
+        if not line:
+            continue
+        if _is_boilerplate(line):
+            removed_lines += 1
+            continue
+        lines.append(line)
+    return '\n'.join(lines), removed_lines
+
+def normalize_bill_text(text):
+    """
+    Strip page headers, line numbers, the coding legend and drafting codes from
+    extracted bill text and collapse whitespace.
+
+    Returns the normalized text and a report of the estimated token reduction.
+    """
+    normalized, removed_lines = _normalize(text)
+    return normalized, _report(text, normalized, removed_lines)
+
+def normalize_pages(pages):
+    """normalize_bill_text for per-page text; returns the normalized pages and one report"""
+    results = [_normalize(page) for page in pages]
+    normalized_pages = [normalized for normalized, removed in results]
+    removed_lines = sum(removed for normalized, removed in results)
+    return normalized_pages, _report('\n'.join(pages), '\n'.join(normalized_pages), removed_lines)
+
+def _report(text, normalized, removed_lines):
+    original_tokens = estimate_tokens(text)
+    normalized_tokens = estimate_tokens(normalized)
+    report = {
+        "original_tokens": original_tokens,
+        "normalized_tokens": normalized_tokens,
+        "reduction_pct": round(100 * (original_tokens - normalized_tokens) / original_tokens, 1),
+        "removed_lines": removed_lines
+    }
+    with _stats_lock:
+        _stats["documents"] += 1
+        _stats["original_tokens"] += original_tokens
+        _stats["normalized_tokens"] += normalized_tokens
+    logger.info(f"Normalized bill text: {original_tokens} -> {normalized_tokens} tokens ({report['reduction_pct']}% fewer)")
+    return report
+
+def normalization_stats():
+    """Token reduction achieved by normalize_bill_text since process start"""
+    with _stats_lock:
+        stats = dict(_stats)
+    original = stats["original_tokens"]
+    stats["reduction_pct"] = round(100 * (original - stats["normalized_tokens"]) / original, 1) if original else 0.0
+    return stats
+
+def _underline_segments(page):
+    # Underlines are drawn as thin horizontal lines or rectangles under the text
+    segments = []
+    for drawing in page.get_drawings():
+        for item in drawing["items"]:
+            if item[0] == "l":
+                start, end = item[1], item[2]
+                if abs(start.y - end.y) < 1:
+                    segments.append((min(start.x, end.x), max(start.x, end.x), start.y))
+            elif item[0] == "re":
+                rect = item[1]
+                if rect.height < 2 and rect.width > 2:
+                    segments.append((rect.x0, rect.x1, (rect.y0 + rect.y1) / 2))
+    return segments
+
+def _is_underlined(bbox, segments):
+    x0, y0, x1, y1 = bbox
+    width = max(x1 - x0, 1)
+    for seg_x0, seg_x1, seg_y in segments:
+        # Below the baseline region, not through the middle (that's a strike-through)
+        if y1 - (y1 - y0) * 0.25 <= seg_y <= y1 + 3:
+            overlap = min(x1, seg_x1) - max(x0, seg_x0)
+            if overlap > width * 0.5:
+                return True
+    return False
+
+def extract_underlined_text(pdf):
+    """
+    Return only the underlined (added) text of a bill PDF, one line per text line.
+
+    pdf is an open fitz document. Struck-through and plain text are dropped.
+    """
+    lines = []
+    for page in pdf:
+        segments = _underline_segments(page)
+        if not segments:
+            continue
+        for block in page.get_text("dict")["blocks"]:
+            for line in block.get("lines", []):
+                spans = [span["text"] for span in line["spans"] if span["text"].strip() and _is_underlined(span["bbox"], segments)]
+                if spans:
+                    lines.append(' '.join(spans))
+    return '\n'.join(lines)
@@ -1,10 +1,11 @@
-import requests
+import copy
 import logging
 import json
 import re
 import time
 from typing import Dict, Optional
 from .logger_config import webflow_logger
+from .http_client import get_http_session
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
@@ -103,7 +104,7 @@ class WebflowAPI:
     def fetch_all_cms_items(self):
         """Fetch all CMS items from the Webflow collection (V2 API)."""
         items_endpoint = f"{self.base_url}/collections/{self.collection_id}/items"
-        response = requests.get(items_endpoint, headers=self.headers)
+        response = get_http_session().get(items_endpoint, headers=self.headers)
 
         webflow_logger.info(f"Fetching CMS items from: {items_endpoint}")
 
@@ -129,7 +130,7 @@ class WebflowAPI:
         
         # Fetch all items from member organizations collection
         items_endpoint = f"{self.base_url}/collections/{self.member_org_collection_id}/items"
-        response = requests.get(items_endpoint, headers=self.headers)
+        response = get_http_session().get(items_endpoint, headers=self.headers)
         
         if response.status_code != 200:
             webflow_logger.error(f"Failed to fetch member organizations: {response.status_code} - {response.text}")
@@ -175,7 +176,7 @@ class WebflowAPI:
         
         # Create new organization
         create_endpoint = f"{self.base_url}/collections/{self.member_org_collection_id}/items/live"
-        response = requests.post(create_endpoint, headers=self.headers, json=data)
+        response = get_http_session().post(create_endpoint, headers=self.headers, json=data)
         
         if response.status_code not in [200, 201, 202]:
             webflow_logger.error(f"Failed to create member organization: {response.status_code} - {response.text}")
@@ -258,7 +259,7 @@ class WebflowAPI:
 
             # Updated endpoint for V2 API
             create_item_endpoint = f"{self.base_url}/collections/{self.collection_id}/items/live"
-            response = requests.post(create_item_endpoint, headers=self.headers, json=data)
+            response = get_http_session().post(create_item_endpoint, headers=self.headers, json=data)
             webflow_logger.info(f"Webflow API Response Status: {response.status_code}, Response Text: {response.text}")
 
             if response.status_code == 409:
@@ -270,7 +271,7 @@ class WebflowAPI:
                 
                 time.sleep(5)
                 
-                response = requests.post(create_item_endpoint, headers=self.headers, json=data)
+                response = get_http_session().post(create_item_endpoint, headers=self.headers, json=data)
                 webflow_logger.info(f"Retry Response Status: {response.status_code}, Response Text: {response.text}")
                 
                 if response.status_code == 409:
@@ -300,7 +301,7 @@ class WebflowAPI:
         update_item_endpoint = f"{self.base_url}/collections/{self.collection_id}/items/{item_id}/live"
 
         # Debugging: Print the JSON payload with sensitive data masked
-        debug_data = data.copy()
+        debug_data = copy.deepcopy(data)
         if 'fieldData' in debug_data:
             if 'support' in debug_data['fieldData']:
                 debug_data['fieldData']['support'] = '[MASKED]'
@@ -309,7 +310,7 @@ class WebflowAPI:
         webflow_logger.info(f"JSON Payload: {json.dumps(debug_data, indent=4)}")
 
         # Making the PATCH request to update the collection item (V2 API uses PATCH)
-        response = requests.patch(update_item_endpoint, headers=self.headers, json=data)
+        response = get_http_session().patch(update_item_endpoint, headers=self.headers, json=data)
         webflow_logger.info(f"Webflow API Response Status: {response.status_code}, Response Text: {response.text}")
 
         if response.status_code not in [200, 201]:
@@ -321,11 +322,36 @@ class WebflowAPI:
     def get_collection_item(self, item_id: str) -> Optional[Dict]:
         get_item_endpoint = f"{self.base_url}/collections/{self.collection_id}/items/{item_id}"
 
-        response = requests.get(get_item_endpoint, headers=self.headers)
+        response = get_http_session().get(get_item_endpoint, headers=self.headers)
         webflow_logger.info(f"Webflow API Response Status: {response.status_code}, Response Text: {response.text}")
 
         if response.status_code in [200, 201]:
             return response.json()
         else:
             webflow_logger.error(f"Failed to get collection item: {response.status_code} - {response.text}")
-            return None
\ No newline at end of file
+            return None
+
+    def add_member_stance(self, item_id: str, org_name: str, support: str) -> bool:
+        """Add an organization's support or opposition to an existing bill item, keeping the stances already on it."""
+        item = self.get_collection_item(item_id)
+        if item is None:
+            return False
+        field_data = item.get('fieldData', {})
+        updates = {}
+
+        org_id = self.handle_member_organization(org_name)
+        member_orgs = list(field_data.get('member-organizations') or [])
+        if org_id and org_id not in member_orgs:
+            updates['member-organizations'] = member_orgs + [org_id]
+
+        # support and oppose hold a comma-separated list of organization names
+        field = {"Support": "support", "Oppose": "oppose"}.get(support)
+        if field:
+            names = [name.strip() for name in (field_data.get(field) or '').split(',') if name.strip()]
+            if org_name not in names:
+                updates[field] = ", ".join(names + [org_name])
+
+        if not updates:
+            webflow_logger.info(f"Stance of {org_name} is already on item {item_id}")
+            return True
+        return self.update_collection_item(item_id, {"fieldData": updates})
@@ -0,0 +1,28 @@
+import os
+import pytest
+from sqlalchemy import create_engine, BIGINT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+# app.db builds its MySQL URL at import; the tests never connect to it
+for name, value in [("DB_HOST", "localhost"), ("DB_PORT", "3306"), ("DB_NAME", "test"),
+                    ("DB_USER", "test"), ("DB_PASSWORD", "test"), ("AWS_DEFAULT_REGION", "us-east-1")]:
+    os.environ.setdefault(name, value)
+
+# SQLite only autoincrements INTEGER primary keys
+@compiles(BIGINT, "sqlite")
+def _compile_bigint(type_, compiler, **kw):
+    return "INTEGER"
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory on a file SQLite database with every table of the models"""
+    from app.models import Base
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.sqlite3'}",
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
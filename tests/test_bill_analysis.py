@@ -0,0 +1,64 @@
+import json
+import pytest
+from app import llm_cache
+from app.cache import SQLiteCache
+from app.bill_processing import generate_bill_analysis, parse_bill_analysis
+
+CATEGORIES = [{"name": "Education", "id": "cat-1"}, {"name": "Health", "id": "cat-2"}]
+
+def analysis(categories):
+    return json.dumps({
+        "summary": "Summary.",
+        "pros": ["Pro 1", "Pro 2", "Pro 3"],
+        "cons": ["Con 1", "Con 2", "Con 3"],
+        "categories": categories
+    })
+
+@pytest.fixture
+def responses(tmp_path, monkeypatch):
+    """Answer OpenAI requests from a list and cache them in a temporary database"""
+    monkeypatch.setattr(llm_cache, "llm_cache", SQLiteCache(str(tmp_path / "llm.sqlite3"), table="llm_responses"))
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_BYPASS", False)
+    answers = []
+
+    def create(model, messages, **options):
+        return {"choices": [{"message": {"content": answers.pop(0)}}]}
+
+    monkeypatch.setattr(llm_cache.openai.ChatCompletion, "create", create)
+    return answers
+
+def test_categories_are_mapped_to_their_ids():
+    result = parse_bill_analysis(analysis(["Health", "Unknown"]), CATEGORIES)
+    assert result["categories"] == ["cat-2"]
+    assert result["pros"] == "1) Pro 1\n2) Pro 2\n3) Pro 3"
+
+@pytest.mark.parametrize("categories", [[], ["Unknown"]])
+def test_analysis_without_valid_categories_is_rejected(categories):
+    with pytest.raises(ValueError, match="categories"):
+        parse_bill_analysis(analysis(categories), CATEGORIES)
+
+def test_amended_analysis_needs_no_categories():
+    result = parse_bill_analysis(analysis([]), categories_list=None)
+    assert "categories" not in result
+
+def test_rejected_analysis_is_not_cached(responses):
+    responses.extend([analysis([]), analysis(["Education"])])
+    with pytest.raises(ValueError):
+        generate_bill_analysis("Bill text", categories_list=CATEGORIES)
+
+    assert generate_bill_analysis("Bill text", categories_list=CATEGORIES)["categories"] == ["cat-1"]
+    assert generate_bill_analysis("Bill text", categories_list=CATEGORIES)["categories"] == ["cat-1"]
+    assert responses == []
+
+def test_cached_analysis_that_no_longer_validates_is_fetched_again(responses):
+    responses.append(analysis(["Health"]))
+    messages = [{"role": "user", "content": "Bill text"}]
+    key = llm_cache.cache_key("gpt-4o", "test-v1", messages)
+    llm_cache.llm_cache.set(key, analysis([]))
+
+    content = llm_cache.chat_completion(
+        "gpt-4o", messages, "test-v1", validate=lambda content: parse_bill_analysis(content, CATEGORIES)
+    )
+
+    assert json.loads(content)["categories"] == ["Health"]
+    assert llm_cache.llm_cache.get(key) == content
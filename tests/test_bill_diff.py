@@ -0,0 +1,29 @@
+from app.bill_diff import diff_bill_text
+
+OLD = """Section 1. Short title.
+This act may be cited as the Test Act.
+Section 2. Fees.
+The fee is $10.
+It is paid yearly.
+Section 3. Effective date.
+This act takes effect July 1.
+"""
+
+def test_identical_texts_have_no_hunks():
+    assert diff_bill_text(OLD, OLD) == []
+
+def test_only_changed_sections_are_diffed():
+    new = OLD.replace("The fee is $10.", "The fee is $25.")
+    hunks = diff_bill_text(OLD, new)
+    assert len(hunks) == 1
+    assert "-The fee is $10." in hunks[0]
+    assert "+The fee is $25." in hunks[0]
+    assert "Short title" not in hunks[0]
+    assert "Effective date" not in hunks[0]
+
+def test_added_section():
+    new = OLD + "Section 4. Penalties.\nA penalty applies.\n"
+    hunks = diff_bill_text(OLD, new)
+    assert len(hunks) == 1
+    assert "+Section 4. Penalties." in hunks[0]
+    assert "+A penalty applies." in hunks[0]
@@ -0,0 +1,90 @@
+import io
+import gzip
+from bs4 import BeautifulSoup
+from urllib3.response import HTTPResponse
+from app import bill_processing
+from app.bill_xml import parse_bill_xml
+
+BILL_XML = b"""<?xml version="1.0"?>
+<bill bill-stage="Introduced-in-House" xmlns:dc="http://purl.org/dc/elements/1.1/">
+<metadata><dublinCore><dc:title>118 HR 1 IH: Test Act</dc:title><dc:publisher>U.S. House</dc:publisher></dublinCore></metadata>
+<form><congress>118th CONGRESS</congress><session>1st Session</session>
+<legis-num>H. R. 1</legis-num><official-title>To do <term>things</term>, and for other purposes.</official-title></form>
+<legis-body><section id="a"><enum>1.</enum><header>Short title</header><text>This Act may be cited as the <quote>Test Act</quote>.</text></section>
+<section><enum>2.</enum><header>Definitions</header><text>In this Act:</text>
+<paragraph><enum>(1)</enum><header>Thing</header><text>The term <term>thing</term> means a thing.</text></paragraph>
+<paragraph><enum>(2)</enum><text>Another term.</text></paragraph></section>
+<title><enum>I</enum><header>Stuff</header>
+<section><enum>101.</enum><header>Stuff happens</header><text>Stuff happens.</text></section> and a tail
+</title></legis-body>
+<attestation>Passed the House.</attestation></bill>
+"""
+
+def test_text_matches_beautifulsoup_get_text():
+    bill_text = parse_bill_xml(io.BytesIO(BILL_XML))
+    assert bill_text.text == BeautifulSoup(BILL_XML, "lxml-xml").get_text()
+
+def test_titles_and_sections():
+    bill_text = parse_bill_xml(io.BytesIO(BILL_XML))
+    assert bill_text.title == "118 HR 1 IH: Test Act"
+    assert bill_text.official_title == "To do things, and for other purposes."
+    assert [(section["enum"], section["header"]) for section in bill_text.sections] == [
+        ("1.", "Short title"), ("2.", "Definitions"), ("101.", "Stuff happens")
+    ]
+    assert "The term thing means a thing." in bill_text.sections[1]["text"]
+
+def test_units_cover_the_text_at_section_boundaries():
+    bill_text = parse_bill_xml(io.BytesIO(BILL_XML))
+    units = bill_text.units()
+    section_texts = [section["text"] for section in bill_text.sections]
+    assert [unit for unit in units if unit in section_texts] == section_texts
+    assert "".join("".join(units).split()) == "".join(bill_text.text.split())
+
+def test_missing_title():
+    bill_text = parse_bill_xml(io.BytesIO(b"<bill><legis-body><section><text>Text.</text></section></legis-body></bill>"))
+    assert bill_text.title == "No title available"
+    assert bill_text.official_title is None
+    assert bill_text.text == "Text."
+
+class StreamedResponse:
+    """A streamed requests response whose body can only be read from raw"""
+
+    def __init__(self, body, status_code=200):
+        self.status_code = status_code
+        self.raw = HTTPResponse(
+            body=io.BytesIO(gzip.compress(body)), headers={"Content-Encoding": "gzip"},
+            status=status_code, preload_content=False, decode_content=False
+        )
+
+    @property
+    def content(self):
+        raise AssertionError("the whole body was read into memory")
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def test_federal_bill_xml_is_parsed_from_the_stream(monkeypatch):
+    requested = []
+
+    class Session:
+        def get(self, url, **kwargs):
+            requested.append(kwargs)
+            return StreamedResponse(BILL_XML)
+
+    monkeypatch.setattr(bill_processing, "get_http_session", lambda: Session())
+    monkeypatch.setattr(bill_processing, "resolve_federal_version", lambda *args: "ih")
+    monkeypatch.setattr(bill_processing, "federal_bill_details", lambda session, bill, bill_type, bill_text, url: bill_text)
+
+    bill_text = bill_processing.fetch_federal_bill_details("118", "1", "HR")
+
+    assert requested == [{"stream": True}]
+    assert bill_text.text == BeautifulSoup(BILL_XML, "lxml-xml").get_text()
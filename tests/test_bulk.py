@@ -0,0 +1,108 @@
+import zipfile
+import pytest
+from app import bulk
+from app.jobs import JobQueue
+from app.models import Bill, ProcessingStatus
+
+def job_statuses(session_factory):
+    db = session_factory()
+    try:
+        return {job.submission_id: job.status for job in db.query(ProcessingStatus).all()}
+    finally:
+        db.close()
+
+def store_bill(session_factory, history_value):
+    db = session_factory()
+    db.add(Bill(history=history_value, govId=history_value))
+    db.commit()
+    db.close()
+
+@pytest.fixture
+def job_queue(session_factory):
+    return JobQueue(session_factory)
+
+def test_session_ingestion_skips_stored_bills_and_records_each_bill(session_factory, job_queue, monkeypatch):
+    monkeypatch.setattr(bulk, "list_session_bills", lambda year: ["SB1", "SB2", "SB3"])
+    store_bill(session_factory, "2024SB1")
+    processed = []
+
+    def process_bill(db, request, history_value):
+        processed.append(history_value)
+        if history_value == "2024SB3":
+            raise ValueError("no bill text")
+        store_bill(session_factory, history_value)
+        return "Bill processed"
+
+    message = bulk.ingest_session(session_factory, 2024, process_bill, job_queue.set_status, job_queue.claim)
+
+    assert sorted(processed) == ["2024SB2", "2024SB3"]
+    assert message == "Bulk ingestion of 2024 finished: 1 processed, 1 failed, 1 skipped"
+    statuses = job_statuses(session_factory)
+    assert (statuses["2024SB2"], statuses["2024SB3"]) == ("completed", "failed")
+    assert "2024SB1" not in statuses
+
+def test_rerun_resumes_with_the_bills_not_stored(session_factory, job_queue, monkeypatch):
+    monkeypatch.setattr(bulk, "list_session_bills", lambda year: ["SB1", "SB2"])
+    store_bill(session_factory, "2024SB1")
+    processed = []
+
+    bulk.ingest_session(session_factory, 2024, lambda db, request, hv: processed.append(hv) or store_bill(session_factory, hv), job_queue.set_status, job_queue.claim)
+    bulk.ingest_session(session_factory, 2024, lambda db, request, hv: pytest.fail("processed twice"), job_queue.set_status, job_queue.claim)
+
+    assert processed == ["2024SB2"]
+
+def test_bill_claimed_elsewhere_is_skipped(session_factory, job_queue, monkeypatch):
+    monkeypatch.setattr(bulk, "list_session_bills", lambda year: ["SB1"])
+    # The pending list is made first; the bill is submitted through /update-bill/ before it comes up
+    monkeypatch.setattr(bulk, "_needs_processing", lambda db, history_value: job_queue.claim(history_value) or True)
+
+    message = bulk.ingest_session(session_factory, 2024, lambda *args: pytest.fail("processed twice"), job_queue.set_status, job_queue.claim)
+
+    assert message.endswith("0 processed, 0 failed, 1 skipped")
+    assert job_statuses(session_factory)["2024SB1"] == "queued"
+
+def bill_xml(title):
+    return f"<bill><metadata><dublinCore><dc:title xmlns:dc='http://purl.org/dc/elements/1.1/'>{title}</dc:title></dublinCore></metadata><legis-body><section><text>{title} text.</text></section></legis-body></bill>"
+
+def write_archive(path, members):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return str(path)
+
+def test_latest_version_of_each_bill_is_chosen(tmp_path):
+    path = write_archive(tmp_path / "BILLS-118-1-hr.zip", {
+        "BILLS-118hr1ih.xml": bill_xml("Introduced"),
+        "BILLS-118hr1rh.xml": bill_xml("Reported"),
+        "BILLS-118s2is.xml": bill_xml("Senate"),
+        "BILLS-118xx3ih.xml": bill_xml("Unknown type"),
+        "README.txt": "not a bill"
+    })
+    with zipfile.ZipFile(path) as archive:
+        versions = bulk.latest_archive_versions(archive)
+    assert {key: version for key, (version, info) in versions.items()} == {
+        ("118", "HR", "1"): "rh", ("118", "S", "2"): "is"
+    }
+
+def test_archive_ingestion_parses_each_bill_once(session_factory, job_queue, tmp_path, monkeypatch):
+    path = write_archive(tmp_path / "BILLS-118-1-hr.zip", {
+        "BILLS-118hr1ih.xml": bill_xml("Introduced"),
+        "BILLS-118hr1rh.xml": bill_xml("Reported"),
+        "BILLS-118hr2ih.xml": bill_xml("Stored"),
+        "BILLS-118hr3ih.xml": "<bill><legis-body>"
+    })
+    monkeypatch.setattr(bulk, "federal_bill_details", lambda session, bill, bill_type, bill_text, url: {"title": bill_text.title, "url": url})
+    store_bill(session_factory, "118HR2")
+    processed = []
+
+    def process_bill(db, request, details):
+        processed.append((request.session, request.bill_type, request.bill_number, details["title"]))
+        return "Bill processed"
+
+    message = bulk.ingest_govinfo_archive(session_factory, path, process_bill, job_queue.set_status, job_queue.claim)
+
+    assert processed == [("118", "HR", "1", "Reported")]
+    assert message == "Bulk ingestion of BILLS-118-1-hr.zip finished: 1 processed, 1 failed, 1 skipped"
+    statuses = job_statuses(session_factory)
+    assert (statuses["118HR1"], statuses["118HR3"]) == ("completed", "failed")
+    assert statuses["bulk-BILLS-118-1-hr"] == "processing"
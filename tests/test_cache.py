@@ -0,0 +1,75 @@
+import pytest
+from app import cache, llm_cache
+from app.cache import SQLiteCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    return now
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    store = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    store.set("a", "1")
+    clock[0] += 1
+    store.set("b", "2")
+    clock[0] += 1
+    assert store.get("a") == "1"
+    clock[0] += 1
+    store.set("c", "3")
+
+    assert store.get("b") is None
+    assert (store.get("a"), store.get("c")) == ("1", "3")
+
+def test_expired_entries_are_misses(tmp_path, clock):
+    store = SQLiteCache(str(tmp_path / "cache.sqlite3"), ttl=60)
+    store.set("a", "1")
+    store.set("b", "2", ttl=600)
+    clock[0] += 61
+
+    assert store.get("a") is None
+    assert store.get("b") == "2"
+    assert store.items() == [("b", "2")]
+    assert store.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1, "max_entries": 10000}
+
+def test_tables_in_one_file_are_separate(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first, second = SQLiteCache(path, table="first"), SQLiteCache(path, table="second")
+    first.set("key", "first")
+    assert second.get("key") is None
+    first.delete("key")
+    assert first.get("key") is None
+    with pytest.raises(ValueError):
+        SQLiteCache(path, table="bad table")
+
+@pytest.fixture
+def openai_calls(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "llm_cache", SQLiteCache(str(tmp_path / "llm.sqlite3"), table="llm_responses"))
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_BYPASS", False)
+    calls = []
+
+    def create(model, messages, **options):
+        calls.append(messages)
+        return {"choices": [{"message": {"content": f"Response {len(calls)}"}}]}
+
+    monkeypatch.setattr(llm_cache.openai.ChatCompletion, "create", create)
+    return calls
+
+MESSAGES = [{"role": "user", "content": "Bill text"}]
+
+def test_repeated_prompts_are_answered_from_the_cache(openai_calls):
+    assert llm_cache.chat_completion("gpt-4o", MESSAGES, "summary-v1") == "Response 1"
+    assert llm_cache.chat_completion("gpt-4o", MESSAGES, "summary-v1") == "Response 1"
+    # A new prompt version is a new entry
+    assert llm_cache.chat_completion("gpt-4o", MESSAGES, "summary-v2") == "Response 2"
+    assert len(openai_calls) == 2
+
+def test_bypass_skips_the_read_but_refreshes_the_entry(openai_calls):
+    llm_cache.chat_completion("gpt-4o", MESSAGES, "summary-v1")
+    assert llm_cache.chat_completion("gpt-4o", MESSAGES, "summary-v1", bypass_cache=True) == "Response 2"
+    assert llm_cache.chat_completion("gpt-4o", MESSAGES, "summary-v1") == "Response 2"
+
+def test_cache_key_depends_on_the_options():
+    assert llm_cache.cache_key("gpt-4o", "summary-v1", MESSAGES) != llm_cache.cache_key(
+        "gpt-4o", "summary-v1", MESSAGES, {"response_format": {"type": "json_object"}}
+    )
@@ -0,0 +1,53 @@
+from app import bill_processing
+from app.chunking import split_into_chunks, split_sections, estimate_tokens
+
+def sections(count, words=50):
+    return "\n".join(f"Section {number}. " + "word " * words for number in range(1, count + 1))
+
+def test_sections_are_kept_whole_and_packed():
+    text = sections(10)
+    chunks = split_into_chunks(text, max_tokens=200)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 200 for chunk in chunks)
+    assert all(chunk.startswith("Section ") for chunk in chunks)
+    assert "\n".join(chunks) == "\n".join(split_sections(text))
+
+def test_small_text_is_one_chunk():
+    text = sections(2, words=5)
+    assert split_into_chunks(text, max_tokens=1000) == ["\n".join(split_sections(text))]
+
+def test_pages_are_the_boundaries_when_given():
+    pages = ["first page " * 20, "   ", "second page " * 20, "third page " * 20]
+    chunks = split_into_chunks("ignored", max_tokens=130, pages=pages)
+    assert chunks == [pages[0] + "\n" + pages[2], pages[3]]
+
+def test_oversized_units_are_split():
+    text = "Section 1. " + "x" * 4000
+    chunks = split_into_chunks(text, max_tokens=100)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 400 for chunk in chunks)
+    assert "".join(chunks) == text
+
+def test_chunks_at_the_budget_boundary_stay_within_it():
+    # Slices of an oversized unit, and packed units with their separators, must not go one token over
+    assert [estimate_tokens(chunk) for chunk in split_into_chunks("x" * 1600, max_tokens=200)] == [200, 200, 1]
+    pages = ["a" * 398, "b" * 399, "c" * 400]
+    for chunk in split_into_chunks("ignored", max_tokens=200, pages=pages):
+        assert estimate_tokens(chunk) <= 200
+    assert split_into_chunks("ignored", max_tokens=200, pages=pages[:2]) == ["a" * 398 + "\n" + "b" * 399]
+
+def test_chunk_summaries_name_the_jurisdiction(monkeypatch):
+    prompts = []
+
+    def summarize(messages, **kwargs):
+        prompts.append(messages[0]["content"])
+        return "Summary"
+
+    monkeypatch.setattr(bill_processing, "chat_completion", lambda **kwargs: summarize(**kwargs))
+    monkeypatch.setattr(bill_processing, "MAP_REDUCE_THRESHOLD_TOKENS", 100)
+    monkeypatch.setattr(bill_processing, "MAP_REDUCE_CHUNK_TOKENS", 100)
+
+    bill_processing.condense_bill_text(sections(10), jurisdiction="the US Congress")
+
+    assert len(prompts) > 1
+    assert all("the US Congress" in prompt and "Florida" not in prompt for prompt in prompts)
@@ -0,0 +1,67 @@
+import pytest
+from app import http_cache
+from app.cache import SQLiteCache
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+class FakeSession:
+    """Answers 304 when the request carries the ETag it served"""
+
+    def __init__(self, etag):
+        self.etag = etag
+        self.sent = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent.append(headers)
+        if headers.get("If-None-Match") == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, {"ETag": self.etag, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    path = str(tmp_path / "http.sqlite3")
+    for name in ("validator_cache", "artifact_cache", "savings_cache"):
+        monkeypatch.setattr(http_cache, name, SQLiteCache(path, table=name))
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_ENABLED", True)
+    session = FakeSession('"v1"')
+    monkeypatch.setattr(http_cache, "get_http_session", lambda: session)
+    return session
+
+def test_repeat_fetch_is_conditional_and_counted(session):
+    url = "https://www.flsenate.gov/bill.pdf"
+    response, entry = http_cache.conditional_get(url)
+    assert (response.status_code, entry) == (200, None)
+    http_cache.remember_response(url, response, sha256="abc", size=1000)
+
+    response, entry = http_cache.conditional_get(url)
+
+    assert session.sent[1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert response.status_code == 304
+    assert entry["sha256"] == "abc"
+    stats = http_cache.http_cache_stats()
+    assert stats["bytes_saved"] == 1000
+    assert stats["daily"][0]["requests"] == 2 and stats["daily"][0]["not_modified"] == 1
+
+def test_changed_document_is_downloaded_again(session):
+    url = "https://www.flsenate.gov/bill.pdf"
+    http_cache.remember_response(url, http_cache.conditional_get(url)[0], sha256="abc", size=1000)
+    session.etag = '"v2"'
+
+    response, entry = http_cache.conditional_get(url)
+
+    assert response.status_code == 200
+    assert entry["sha256"] == "abc"
+
+def test_responses_without_validators_are_not_remembered(session):
+    http_cache.remember_response("https://example.com", FakeResponse(200), sha256="abc", size=10)
+    assert http_cache.validator_cache.get("https://example.com") is None
+
+def test_artifacts_are_keyed_by_content_hash(session, monkeypatch):
+    http_cache.set_artifact("abc", "text", ["page 1"])
+    assert http_cache.get_artifact("abc", "text") == ["page 1"]
+    assert http_cache.get_artifact("def", "text") is None
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_ENABLED", False)
+    assert http_cache.get_artifact("abc", "text") is None
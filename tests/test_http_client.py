@@ -0,0 +1,25 @@
+import pytest
+from app import http_client
+from app.http_client import HostRateLimiter, parse_host_rates
+
+def test_host_rates_are_parsed():
+    assert parse_host_rates("www.flsenate.gov=2, WWW.Congress.gov=0.5,") == {"www.flsenate.gov": 2.0, "www.congress.gov": 0.5}
+    assert parse_host_rates("") == {}
+    with pytest.raises(ValueError):
+        parse_host_rates("www.flsenate.gov")
+
+def test_each_host_has_its_own_rate_and_schedule(monkeypatch):
+    clock = [100.0]
+    sleeps = []
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+    limiter = HostRateLimiter(5, {"slow.example.com": 1, "free.example.com": 0})
+
+    for _ in range(3):
+        limiter.wait("slow.example.com")
+        limiter.wait("fast.example.com")
+        limiter.wait("free.example.com")
+
+    # Waits on one host don't push back the others
+    assert sleeps == pytest.approx([1.0, 0.2, 2.0, 0.4])
+    assert limiter.interval("SLOW.example.com") == 1.0
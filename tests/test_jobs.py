@@ -0,0 +1,107 @@
+import queue
+import datetime
+import pytest
+import threading
+from app.jobs import JobQueue, JOB_STALE_AFTER_MINUTES
+from app.models import ProcessingStatus
+
+def job_row(session_factory, submission_id):
+    db = session_factory()
+    try:
+        return db.query(ProcessingStatus).filter(ProcessingStatus.submission_id == submission_id).first()
+    finally:
+        db.close()
+
+def test_claim_is_granted_once_across_threads(session_factory):
+    job_queue = JobQueue(session_factory)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def claim():
+        barrier.wait()
+        results.append(job_queue.claim("2024SB1", "Waiting for a worker"))
+
+    threads = [threading.Thread(target=claim) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 1
+    assert job_row(session_factory, "2024SB1").status == "queued"
+
+def test_claim_refuses_active_jobs_and_allows_finished_ones(session_factory):
+    job_queue = JobQueue(session_factory)
+    assert job_queue.claim("2024SB1")
+
+    job_queue.set_status("2024SB1", "processing", "Processing started")
+    assert not job_queue.claim("2024SB1")
+
+    for status in ("completed", "failed"):
+        job_queue.set_status("2024SB1", status)
+        assert job_queue.claim("2024SB1")
+        job_queue.set_status("2024SB1", "processing")
+
+def test_claim_takes_over_stale_jobs(session_factory):
+    job_queue = JobQueue(session_factory)
+    job_queue.set_status("2024SB1", "processing")
+
+    db = session_factory()
+    stale = datetime.datetime.now() - datetime.timedelta(minutes=JOB_STALE_AFTER_MINUTES + 1)
+    db.query(ProcessingStatus).update({"updated_at": stale}, synchronize_session=False)
+    db.commit()
+    db.close()
+
+    assert job_queue.claim("2024SB1")
+
+def test_recover_fails_only_the_owners_active_jobs(session_factory):
+    restarted = JobQueue(session_factory, owner="api-1")
+    other = JobQueue(session_factory, owner="api-2")
+    assert restarted.claim("2024SB1")
+    assert restarted.claim("2024SB2")
+    restarted.set_status("2024SB2", "completed")
+    assert other.claim("2024SB3")
+
+    assert restarted.recover() == 1
+    assert job_row(session_factory, "2024SB1").status == "failed"
+    assert job_row(session_factory, "2024SB2").status == "completed"
+    assert job_row(session_factory, "2024SB3").status == "queued"
+    assert restarted.claim("2024SB1")
+
+def test_shutdown_does_not_block_on_a_full_queue(session_factory):
+    job_queue = JobQueue(session_factory, max_workers=1, max_queue_size=1)
+    job_queue.start()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_job(db):
+        started.set()
+        release.wait(5)
+
+    assert job_queue.enqueue("2024SB1", slow_job)
+    assert started.wait(5)
+    assert job_queue.enqueue("2024SB2", slow_job)
+
+    job_queue.shutdown(wait=False)
+    release.set()
+
+def test_hooks_run_on_completion_and_failure(session_factory):
+    calls = []
+    job_queue = JobQueue(
+        session_factory,
+        on_complete=lambda submission_id: calls.append(("completed", submission_id)),
+        on_fail=lambda submission_id: calls.append(("failed", submission_id))
+    )
+    job_queue.set_status("2024SB1", "processing")
+    job_queue.set_status("2024SB1", "completed")
+    job_queue.set_status("2024SB2", "failed")
+    assert calls == [("completed", "2024SB1"), ("failed", "2024SB2")]
+
+def test_full_queue_fails_the_job_without_the_failure_hook(session_factory):
+    calls = []
+    job_queue = JobQueue(session_factory, max_queue_size=1, on_fail=calls.append)
+    assert job_queue.enqueue("2024SB1", lambda db: None)
+    with pytest.raises(queue.Full):
+        job_queue.enqueue("2024SB2", lambda db: None)
+    assert job_row(session_factory, "2024SB2").status == "failed"
+    assert calls == []
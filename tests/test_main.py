@@ -0,0 +1,172 @@
+import io
+import asyncio
+import pytest
+from app import main
+from app.pipeline import create_webflow_item_once
+from app.models import Bill, FormData, FormRequest, PendingSubmission, ProcessingStatus
+
+def form_request(member_organization="Org", support="Support"):
+    return FormRequest(
+        name="Name",
+        email="name@example.com",
+        member_organization=member_organization,
+        year="2024",
+        legislation_type="Florida Bills",
+        session="N/A",
+        bill_number="1",
+        bill_type="SB",
+        support=support,
+        lan="EN"
+    )
+
+@pytest.fixture
+def app_db(session_factory, monkeypatch):
+    monkeypatch.setattr(main, "SessionLocal", session_factory)
+    monkeypatch.setattr(main.job_queue, "session_factory", session_factory)
+    stances = []
+    monkeypatch.setattr(main.webflow_api, "add_member_stance", lambda *args: stances.append(args) or True)
+    return session_factory, stances
+
+def store_bill(session_factory, history_value):
+    db = session_factory()
+    db.add(Bill(history=history_value, govId="SB 1", webflow_link="https://example.com/sb-1", webflow_item_id="item-1"))
+    db.commit()
+    db.close()
+
+def count(session_factory, model):
+    db = session_factory()
+    try:
+        return db.query(model).count()
+    finally:
+        db.close()
+
+def job_status(session_factory, submission_id):
+    db = session_factory()
+    try:
+        return db.query(ProcessingStatus).filter(ProcessingStatus.submission_id == submission_id).first().status
+    finally:
+        db.close()
+
+def test_attached_submissions_are_recorded_when_the_job_completes(app_db):
+    session_factory, stances = app_db
+    assert main.job_queue.claim("20241")
+
+    db = session_factory()
+    content, status_code = main.attach_submission(db, form_request("Org A", "Support"), "20241")
+    main.attach_submission(db, form_request("Org B", "Oppose"), "20241")
+    db.close()
+    assert status_code == 202
+    assert count(session_factory, PendingSubmission) == 2
+    assert stances == []
+
+    store_bill(session_factory, "20241")
+    main.job_queue.set_status("20241", "completed", "Bill processing completed")
+
+    assert count(session_factory, PendingSubmission) == 0
+    assert count(session_factory, FormData) == 2
+    assert sorted(stances) == [("item-1", "Org A", "Support"), ("item-1", "Org B", "Oppose")]
+
+def test_failed_job_is_queued_again_for_an_attached_submission(app_db, monkeypatch):
+    session_factory, stances = app_db
+    queued = []
+    monkeypatch.setattr(main.job_queue, "enqueue", lambda submission_id, func, *args: queued.append((submission_id, func, args)) or True)
+    assert main.job_queue.claim("20241")
+
+    db = session_factory()
+    main.attach_submission(db, form_request("Org A"), "20241")
+    main.attach_submission(db, form_request("Org B"), "20241")
+    db.close()
+    main.job_queue.set_status("20241", "failed", "boom")
+
+    [(submission_id, func, args)] = queued
+    assert (submission_id, func) == ("20241", main.process_florida_bill)
+    assert args[0].member_organization == "Org A"
+    # The other submission waits on the new attempt
+    assert count(session_factory, PendingSubmission) == 1
+    assert count(session_factory, FormData) == 0
+
+def test_attached_submission_stays_when_no_new_attempt_starts(app_db, monkeypatch):
+    session_factory, stances = app_db
+    monkeypatch.setattr(main.job_queue, "enqueue", lambda *args: False)
+    assert main.job_queue.claim("20241")
+
+    db = session_factory()
+    main.attach_submission(db, form_request(), "20241")
+    db.close()
+    main.job_queue.set_status("20241", "failed", "boom")
+
+    assert count(session_factory, PendingSubmission) == 1
+
+def test_submission_attached_after_the_job_finished_is_recorded_at_once(app_db):
+    session_factory, stances = app_db
+    store_bill(session_factory, "20241")
+    main.job_queue.set_status("20241", "completed", "Bill processing completed")
+
+    db = session_factory()
+    main.attach_submission(db, form_request(), "20241")
+    db.close()
+
+    assert count(session_factory, PendingSubmission) == 0
+    assert count(session_factory, FormData) == 1
+    assert stances == [("item-1", "Org", "Support")]
+
+def federal_request(member_organization="Org"):
+    return form_request(member_organization).model_copy(update={
+        "legislation_type": "Federal Bills", "session": "118", "bill_type": "HR"
+    })
+
+def test_job_for_a_bill_stored_meanwhile_only_records_the_stance(app_db, monkeypatch):
+    session_factory, stances = app_db
+    monkeypatch.setattr(main, "run_stages", lambda *args, **kwargs: pytest.fail("the pipeline ran again"))
+    store_bill(session_factory, "20241")
+
+    db = session_factory()
+    message = main.process_florida_bill(db, form_request(), "20241")
+    db.close()
+
+    assert message == "Bill already stored: https://example.com/sb-1"
+    assert count(session_factory, FormData) == 1
+    assert stances == [("item-1", "Org", "Support")]
+
+def test_federal_endpoint_refuses_a_bill_being_processed(app_db, monkeypatch):
+    session_factory, stances = app_db
+    monkeypatch.setattr(main, "run_stages_async", lambda *args, **kwargs: pytest.fail("the pipeline ran"))
+    assert main.job_queue.claim("118HR1")
+
+    response = asyncio.run(main.process_federal_bill(federal_request(), session_factory()))
+
+    assert response.status_code == 409
+
+def test_federal_endpoint_records_its_job(app_db, monkeypatch):
+    session_factory, stances = app_db
+
+    async def fake_stages(stages, **inputs):
+        assert job_status(session_factory, "118HR1") == "processing"
+        return {
+            "details": {"govId": "HR 1", "billTextPath": "s3://bill", "title": "HR 1"},
+            "summary": "Summary", "pros": "Pros", "cons": "Cons",
+            "webflow": ("item-1", "hr-1"), "report": io.BytesIO(b"%PDF")
+        }
+    monkeypatch.setattr(main, "run_stages_async", fake_stages)
+
+    response = asyncio.run(main.process_federal_bill(federal_request(), session_factory()))
+
+    assert response.status_code == 200
+    assert job_status(session_factory, "118HR1") == "completed"
+    assert count(session_factory, Bill) == 1
+
+def test_retry_reuses_the_webflow_item_of_the_failed_attempt(app_db):
+    session_factory, stances = app_db
+    created = []
+
+    def create():
+        created.append(1)
+        return ("item-1", "sb-1")
+
+    assert main.job_queue.claim("20241")
+    assert create_webflow_item_once(main.WebflowItems("20241"), create) == ("item-1", "sb-1")
+    main.job_queue.set_status("20241", "failed", "save failed")
+
+    assert main.job_queue.claim("20241")
+    assert create_webflow_item_once(main.WebflowItems("20241"), create) == ("item-1", "sb-1")
+    assert len(created) == 1
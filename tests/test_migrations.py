@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from app.migrations import (
+    MIGRATIONS, migrate, schema_problems, create_base_tables, add_bill_versions, add_batch_groups,
+    add_pending_submissions, add_job_owners
+)
+from app.models import BillVersion, PendingSubmission
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.sqlite3'}")
+    yield engine
+    engine.dispose()
+
+def test_migrations_build_the_schema_of_the_models(engine):
+    assert migrate(engine) == [version for version, description, migration in MIGRATIONS]
+    assert schema_problems(engine) == []
+
+def test_migrations_run_once(engine):
+    migrate(engine)
+    assert migrate(engine) == []
+
+def test_existing_database_is_upgraded(engine):
+    # A database from before the migrations, with data in it
+    with engine.begin() as conn:
+        create_base_tables(conn)
+        conn.execute(text("INSERT INTO bill (history, govId) VALUES ('20241', 'SB 1')"))
+        conn.execute(text("INSERT INTO processing_status (submission_id, status) VALUES ('20241', 'completed')"))
+    assert "migration 0001 not applied (bill_version table for version-aware refresh)" in schema_problems(engine)
+
+    migrate(engine)
+
+    assert schema_problems(engine) == []
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT status, owner FROM processing_status")).fetchall() == [("completed", None)]
+
+def test_duplicate_bills_stop_the_unique_index(engine):
+    with engine.begin() as conn:
+        create_base_tables(conn)
+        conn.execute(text("INSERT INTO bill (history) VALUES ('20241'), ('20241')"))
+
+    with pytest.raises(RuntimeError, match="20241 \\(2 rows\\)"):
+        migrate(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM bill WHERE id = 2"))
+    migrate(engine)
+    assert schema_problems(engine) == []
+
+def columns(conn, table):
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+def model_columns(model):
+    return {column.name for column in model.__table__.columns}
+
+def test_bill_version_migration_matches_the_model(engine):
+    with engine.begin() as conn:
+        create_base_tables(conn)
+        add_bill_versions(conn)
+        assert columns(conn, "bill_version") == model_columns(BillVersion)
+
+def test_batch_group_migration_matches_the_model(engine):
+    with engine.begin() as conn:
+        create_base_tables(conn)
+        add_batch_groups(conn)
+        assert "members" in columns(conn, "processing_status")
+
+def test_coalescing_migrations_match_the_models(engine):
+    with engine.begin() as conn:
+        create_base_tables(conn)
+        add_pending_submissions(conn)
+        add_job_owners(conn)
+        assert columns(conn, "pending_submission") == model_columns(PendingSubmission)
+        assert "owner" in columns(conn, "processing_status")
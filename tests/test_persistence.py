@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app.models import Bill, BillMeta, BillVersion, FormData, FormRequest
+from app.persistence import save_bill, meta_rows, form_data
+
+def request():
+    return FormRequest(
+        name="Name", email="name@example.com", member_organization="Org", year="2024",
+        legislation_type="Florida Bills", session="N/A", bill_number="1", bill_type="SB",
+        support="Support", lan="EN"
+    )
+
+def counts(session_factory):
+    db = session_factory()
+    try:
+        return {model.__name__: db.query(model).count() for model in (Bill, BillMeta, BillVersion, FormData)}
+    finally:
+        db.close()
+
+def save(db, history_value):
+    metas = meta_rows("Summary", "Pros", "Cons") + meta_rows("Resumen", "Pros", "Contras", language="ES")
+    return save_bill(
+        db, Bill(history=history_value, govId="SB 1"), metas,
+        version=BillVersion(fingerprint="abc"), submission=form_data(request(), "SB 1")
+    )
+
+def test_bill_is_stored_with_its_rows(session_factory):
+    db = session_factory()
+    bill = save(db, "20241")
+    db.close()
+
+    assert counts(session_factory) == {"Bill": 1, "BillMeta": 6, "BillVersion": 1, "FormData": 1}
+    db = session_factory()
+    assert {meta.billId for meta in db.query(BillMeta)} == {bill.id}
+    assert db.query(BillVersion).one().billId == bill.id
+    assert db.query(FormData).one().bill_type == "SB"
+    db.close()
+
+def test_failed_save_leaves_nothing_behind(session_factory):
+    db = session_factory()
+    save(db, "20241")
+    with pytest.raises(IntegrityError):
+        save(db, "20241")
+    db.close()
+
+    assert counts(session_factory) == {"Bill": 1, "BillMeta": 6, "BillVersion": 1, "FormData": 1}
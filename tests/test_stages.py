@@ -0,0 +1,40 @@
+import pytest
+from app.stages import Stage, validate_stages, run_stages
+from app.pipeline import (
+    FLORIDA_BILL_STAGES, FLORIDA_FINGERPRINT_STAGES, FLORIDA_CONTENT_STAGES, FLORIDA_AMENDMENT_STAGES,
+    FEDERAL_BILL_STAGES, FEDERAL_DETAILS_STAGES, FEDERAL_CONTENT_STAGES
+)
+
+# Each pipeline with the inputs it is run with in main.py
+@pytest.mark.parametrize("stages, inputs", [
+    (FLORIDA_BILL_STAGES, ["bill_url", "request", "webflow_api", "webflow_items"]),
+    (FLORIDA_FINGERPRINT_STAGES, ["bill_url"]),
+    (FLORIDA_CONTENT_STAGES, ["page", "document", "clean_pages"]),
+    (FLORIDA_AMENDMENT_STAGES, ["page", "document", "hunks", "previous"]),
+    (FEDERAL_BILL_STAGES, ["request", "webflow_api", "webflow_items"]),
+    (FEDERAL_DETAILS_STAGES + FEDERAL_CONTENT_STAGES, ["request", "webflow_api", "webflow_items"]),
+    (FEDERAL_CONTENT_STAGES, ["request", "webflow_api", "webflow_items", "details"]),
+])
+def test_pipelines_are_valid(stages, inputs):
+    validate_stages(stages, inputs)
+
+def test_missing_input_is_reported():
+    with pytest.raises(ValueError, match="bill_url"):
+        validate_stages(FLORIDA_BILL_STAGES, ["request", "webflow_api", "webflow_items"])
+
+def test_cycles_and_duplicates_are_reported():
+    cycle = [Stage("a", lambda b: b, requires=["b"]), Stage("b", lambda a: a, requires=["a"])]
+    with pytest.raises(ValueError, match="cyclic"):
+        validate_stages(cycle, [])
+    with pytest.raises(ValueError, match="Duplicate"):
+        validate_stages([Stage("a", lambda: 1), Stage("a", lambda: 2)], [])
+
+def test_run_stages_passes_results_along():
+    stages = [
+        Stage("double", lambda number: number * 2, requires=["number"]),
+        Stage("label", lambda double, number: f"{number} -> {double}", requires=["double", "number"]),
+        Stage("broken", lambda double: 1 / 0, requires=["double"], optional=True),
+    ]
+    results = run_stages(stages, number=21)
+    assert results["label"] == "21 -> 42"
+    assert results["broken"] is None
@@ -0,0 +1,44 @@
+import fitz
+from app.text_normalizer import normalize_bill_text, normalize_pages, normalization_stats, extract_underlined_text
+
+PAGE = """Florida Senate - 2024 SB 1
+By Senator Name
+20-00123-24 20241234__
+1  A bill to be entitled
+2  An act relating to   education;
+3
+CODING: Words stricken are deletions; words underlined are additions.
+Page 1 of 3
+SB 1 2024
+"""
+
+def test_layout_noise_is_removed():
+    normalized, report = normalize_bill_text(PAGE)
+    assert normalized == "By Senator Name\nA bill to be entitled\nAn act relating to education;"
+    assert report["removed_lines"] == 6
+    assert report["normalized_tokens"] < report["original_tokens"]
+    assert report["reduction_pct"] > 0
+
+def test_pages_are_normalized_separately_with_one_report():
+    pages, report = normalize_pages([PAGE, "4  Section 1. Text.\n5"])
+    assert pages == ["By Senator Name\nA bill to be entitled\nAn act relating to education;", "Section 1. Text."]
+    assert report["removed_lines"] == 7
+
+def test_stats_add_up_across_documents():
+    before = normalization_stats()
+    normalize_bill_text(PAGE)
+    normalize_bill_text(PAGE)
+    after = normalization_stats()
+    assert after["documents"] == before["documents"] + 2
+    assert after["normalized_tokens"] < after["original_tokens"]
+
+def test_only_underlined_text_is_extracted():
+    pdf = fitz.open()
+    page = pdf.new_page()
+    page.insert_text((72, 100), "Existing text", fontsize=11)
+    page.insert_text((72, 130), "Added text", fontsize=11)
+    page.draw_line((72, 132), (140, 132), width=0.5)
+    page.insert_text((72, 160), "Deleted text", fontsize=11)
+    page.draw_line((72, 156), (140, 156), width=0.5)
+
+    assert extract_underlined_text(pdf) == "Added text"
@@ -0,0 +1,52 @@
+import pytest
+from app import webflow
+from app.webflow import WebflowAPI
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.text = str(self._payload)
+
+    def json(self):
+        return self._payload
+
+class FakeSession:
+    """Records PATCH requests and answers GET requests for one item"""
+
+    def __init__(self, item=None):
+        self.item = item
+        self.patches = []
+
+    def get(self, url, headers=None, **kwargs):
+        return FakeResponse(200, self.item)
+
+    def patch(self, url, headers=None, json=None, **kwargs):
+        self.patches.append((url, json))
+        return FakeResponse(200, {})
+
+@pytest.fixture
+def api():
+    return WebflowAPI(api_key="key", collection_id="bills", site_id="site")
+
+def test_update_sends_the_stances_unmasked(api, monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(webflow, "get_http_session", lambda: session)
+    data = {"fieldData": {"support": "Org A, Org B", "oppose": "Org C"}}
+
+    assert api.update_collection_item("item-1", data)
+
+    url, sent = session.patches[0]
+    assert url.endswith("/collections/bills/items/item-1/live")
+    assert sent == {"fieldData": {"support": "Org A, Org B", "oppose": "Org C"}}
+    assert data == sent
+
+def test_add_member_stance_merges_with_the_stances_on_the_item(api, monkeypatch):
+    session = FakeSession({"fieldData": {"support": "Org A", "member-organizations": ["org-a"]}})
+    monkeypatch.setattr(webflow, "get_http_session", lambda: session)
+    monkeypatch.setattr(api, "handle_member_organization", lambda name: "org-b")
+
+    assert api.add_member_stance("item-1", "Org B", "Support")
+
+    url, sent = session.patches[0]
+    assert sent == {"fieldData": {"member-organizations": ["org-a", "org-b"], "support": "Org A, Org B"}}